@@ -1,9 +1,28 @@
 """AURA Agent System"""
 
 from .base_agent import BaseAgent
-from .text_agent import text_agent
-from .image_agent import image_agent
-from .audio_agent import audio_agent
-from .orchestrator import orchestrator
 
 __all__ = ['BaseAgent', 'text_agent', 'image_agent', 'audio_agent', 'orchestrator']
+
+
+def __getattr__(name: str):
+    # Agents set up models, API clients and HTTP pools (audio_agent loads Whisper),
+    # so only construct them when first requested
+    # (the submodule import rebinds the package attribute, so pin the instance)
+    if name == "text_agent":
+        from .text_agent import text_agent
+        globals()["text_agent"] = text_agent
+        return text_agent
+    if name == "audio_agent":
+        from .audio_agent import audio_agent
+        globals()["audio_agent"] = audio_agent
+        return audio_agent
+    if name == "image_agent":
+        from .image_agent import image_agent
+        globals()["image_agent"] = image_agent
+        return image_agent
+    if name == "orchestrator":
+        from .orchestrator import orchestrator
+        globals()["orchestrator"] = orchestrator
+        return orchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
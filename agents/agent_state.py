@@ -4,7 +4,7 @@ Defines the state structure for multi-agent workflows
 """
 
 from typing import TypedDict, List, Dict, Any, Optional, Annotated
-from operator import add
+from operator import add, or_
 
 
 class AgentState(TypedDict):
@@ -15,6 +15,8 @@ class AgentState(TypedDict):
     image_path: Optional[str]
     audio_path: Optional[str]
     document_path: Optional[str]
+    top_k: Optional[int]  # Documents to retrieve (text agent default if None)
+    prefetched_docs: Optional[List[Dict[str, Any]]]  # Pinecone matches fetched in a batch (skips the text agent's search)
     
     # Classification
     query_type: Optional[str]  # "text", "image", "audio", "multi_modal"
@@ -38,3 +40,16 @@ class AgentState(TypedDict):
     # Final output
     final_response: Optional[str]
     sources: Optional[List[Dict[str, Any]]]
+
+
+class AudioState(TypedDict):
+    """State for the audio workflow (transcribe once, fan out to LLM stages)"""
+    
+    # Input
+    audio: Any  # File path or 16 kHz float32 samples
+    input_data: Dict[str, Any]
+    analysis_types: List[str]  # "analyze", "summarize", "translate"
+    
+    # Results
+    transcript_result: Optional[Dict[str, Any]]
+    results: Annotated[Dict[str, Dict[str, Any]], or_]  # Merged from parallel nodes
@@ -3,12 +3,24 @@ Audio Agent for AURA
 Handles audio transcription, analysis, and processing
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import base64
+import io
 from pathlib import Path
+import numpy as np
+from langgraph.graph import StateGraph, END
+from agents.agent_state import AudioState
 from agents.base_agent import BaseAgent
+from config.settings import settings
+from utils.cache import PersistentLRUCache
 from utils.logger import logger
-import tempfile
+import hashlib
+import json
+import logging
+import subprocess
+import threading
 import os
 import shutil
 
@@ -20,33 +32,64 @@ if os.name == 'nt':  # Windows only
         r"C:\Program Files\ffmpeg\bin"
     ]
     
-    for ffmpeg_path in ffmpeg_locations:
-        if os.path.exists(os.path.join(ffmpeg_path, 'ffmpeg.exe')):
-            # Add to PATH if not already there
-            if ffmpeg_path not in os.environ.get('PATH', ''):
-                os.environ['PATH'] = ffmpeg_path + os.pathsep + os.environ.get('PATH', '')
-            logger.info(f"ffmpeg configured: {ffmpeg_path}")
-            
-            # Verify ffmpeg is accessible
-            if shutil.which('ffmpeg'):
-                logger.info("ffmpeg is accessible")
-            break
+    ffmpeg_path = next(
+        (p for p in ffmpeg_locations if os.path.exists(os.path.join(p, 'ffmpeg.exe'))),
+        None
+    )
+    
+    # Add to PATH if not already there
+    if ffmpeg_path and ffmpeg_path not in os.environ.get('PATH', ''):
+        os.environ['PATH'] = ffmpeg_path + os.pathsep + os.environ.get('PATH', '')
+        logger.info(f"ffmpeg configured: {ffmpeg_path}")
+
+# Resolve ffmpeg/ffprobe once (shutil.which scans every PATH entry)
+FFMPEG_PATH = shutil.which('ffmpeg')
+FFPROBE_PATH = shutil.which('ffprobe')
 
 # Audio processing libraries
 try:
-    import whisper
+    from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
     WHISPER_AVAILABLE = True
-    logger.info("Whisper imported successfully")
+    logger.info("faster-whisper imported successfully")
 except ImportError:
     WHISPER_AVAILABLE = False
-    logger.warning("Whisper not available - install with: pip install openai-whisper")
+    logger.warning("faster-whisper not available - install with: pip install faster-whisper")
+
+try:
+    import torch
+    CUDA_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    CUDA_AVAILABLE = False
 
 try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
 except ImportError:
-    PYDUB_AVAILABLE = False
-    logger.warning("pydub not available - install with: pip install pydub")
+    SOUNDFILE_AVAILABLE = False
+    logger.warning("soundfile not available - install with: pip install soundfile")
+
+# Whisper operates on 16 kHz mono float32 audio
+WHISPER_SAMPLE_RATE = 16000
+
+# File path or decoded 16 kHz mono float32 samples
+AudioInput = Union[str, np.ndarray]
+
+# Read size for streaming audio content hashes
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# LLM stages that run on top of a transcript
+TRANSCRIPT_STAGES = ["analyze", "summarize", "translate"]
+
+# Bytes per sample for common libsndfile subtypes
+SOUNDFILE_SAMPLE_WIDTHS = {
+    "PCM_S8": 1,
+    "PCM_U8": 1,
+    "PCM_16": 2,
+    "PCM_24": 3,
+    "PCM_32": 4,
+    "FLOAT": 4,
+    "DOUBLE": 8
+}
 
 
 class AudioAgent(BaseAgent):
@@ -59,32 +102,114 @@ class AudioAgent(BaseAgent):
         )
         
         # Check ffmpeg availability
-        self.ffmpeg_available = shutil.which('ffmpeg') is not None
+        self.ffmpeg_available = FFMPEG_PATH is not None
         if self.ffmpeg_available:
             logger.info("ffmpeg is available for audio processing")
         else:
             logger.warning("ffmpeg not found - some audio formats may not work")
         
-        # Initialize Whisper model
-        self._init_whisper()
+        # Whisper settings (model itself is loaded on first use)
+        # Options: tiny, base, small, medium, large-v3, distil-large-v3, auto
+        self.whisper_model_size = settings.get('audio.whisper_model', 'base')
+        if self.whisper_model_size == "auto":
+            # Distilled decoder is ~2x faster on GPU (English-only)
+            self.whisper_model_size = "distil-large-v3" if CUDA_AVAILABLE else "base"
+        self.batch_size = settings.get('audio.batch_size', 8)
+        self.batch_min_duration = settings.get('audio.batch_min_duration', 60)
+        
+        # Long transcripts are map-reduced in chunks before reaching GPT
+        self.max_transcript_tokens = settings.get('audio.max_transcript_tokens', 3000)
+        self.chunk_concurrency = settings.get('audio.chunk_concurrency', 4)
+        self._whisper_model = None
+        self._whisper_loaded = False
+        self._whisper_lock = threading.Lock()
+        self.batched_model = None
+        
+        # Transcript cache keyed by audio content hash
+        self._transcript_cache = PersistentLRUCache(
+            "whisper_transcripts",
+            max_entries=settings.get('audio.transcript_cache_size', 256)
+        )
+        
+        # Dispatch tables for process() and the LLM stages
+        self._handlers = {
+            "transcribe": self._transcribe_audio,
+            "analyze": self._analyze_audio,
+            "summarize": self._summarize_audio,
+            "translate": self._translate_audio
+        }
+        self._stage_builders = {
+            "analyze": self._analyze_request,
+            "summarize": self._summarize_request,
+            "translate": self._translate_request
+        }
+        
+        # Transcribe -> parallel LLM stages, compiled once
+        self.workflow = self._build_workflow()
         
         logger.info("Audio Agent initialized")
     
+    @property
+    def whisper_model(self):
+        """Whisper model, loaded on first access"""
+        if not self._whisper_loaded:
+            with self._whisper_lock:
+                if not self._whisper_loaded:
+                    self._init_whisper()
+                    self._whisper_loaded = True
+        return self._whisper_model
+    
     def _init_whisper(self):
-        """Initialize Whisper model"""
+        """Initialize Whisper model (CTranslate2 backend via faster-whisper)"""
         if WHISPER_AVAILABLE:
             try:
-                # Use base model (faster, good quality)
-                # Options: tiny, base, small, medium, large
-                self.whisper_model = whisper.load_model("base")
-                logger.info("Whisper base model loaded successfully")
+                # "auto" picks CUDA when available so the encoder runs on GPU
+                device = settings.get('audio.device', 'auto')
+                if device == "auto":
+                    device = "cuda" if CUDA_AVAILABLE else "cpu"
+                
+                # int8 weights halve memory bandwidth (base: ~140 MB fp32 -> ~40 MB);
+                # on GPU activations stay in fp16 (int8_float16)
+                compute_type = settings.get('audio.compute_type', 'auto')
+                if compute_type == "auto":
+                    compute_type = "int8_float16" if device == "cuda" else "int8"
+                
+                self._whisper_model = WhisperModel(
+                    self.whisper_model_size,
+                    device=device,
+                    compute_type=compute_type
+                )
+                logger.info(
+                    f"Whisper {self.whisper_model_size} model loaded successfully "
+                    f"(device: {device}, compute_type: {compute_type})"
+                )
+                
+                # Batched pipeline shares the same weights; used for long audio
+                self.batched_model = BatchedInferencePipeline(model=self._whisper_model)
+                
+                if settings.get('audio.warmup', True):
+                    self._warmup_whisper()
             except Exception as e:
                 logger.error(f"Failed to load Whisper model: {e}")
-                self.whisper_model = None
+                self._whisper_model = None
         else:
-            self.whisper_model = None
+            self._whisper_model = None
             logger.warning("Whisper not available - transcription will be limited")
     
+    def _warmup_whisper(self):
+        """Run one second of silence through the model to pay one-time init costs up front"""
+        try:
+            silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+            segments, _ = self._whisper_model.transcribe(silence, beam_size=1)
+            list(segments)  # Segments are lazy; consume to actually run the decoder
+            logger.info("Whisper warm-up complete")
+        except Exception as e:
+            logger.warning(f"Whisper warm-up failed: {e}")
+    
+    def warmup(self):
+        """Load (and warm up) the Whisper model ahead of the first request"""
+        return self.whisper_model is not None
+    
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process audio with various analysis types
@@ -110,9 +235,9 @@ class AudioAgent(BaseAgent):
             analysis_type = input_data.get("analysis_type", "transcribe")
             
             # Get audio data
-            audio_path = self._get_audio_path(input_data)
+            audio = self._get_audio_input(input_data)
             
-            if not audio_path:
+            if audio is None:
                 return {
                     "success": False,
                     "error": "No audio provided or invalid audio format"
@@ -121,20 +246,15 @@ class AudioAgent(BaseAgent):
             logger.info(f"Processing audio with analysis type: {analysis_type}")
             
             # Route to appropriate method
-            if analysis_type == "transcribe":
-                return self._transcribe_audio(audio_path, input_data)
-            elif analysis_type == "analyze":
-                return self._analyze_audio(audio_path, input_data)
-            elif analysis_type == "summarize":
-                return self._summarize_audio(audio_path, input_data)
-            elif analysis_type == "translate":
-                return self._translate_audio(audio_path, input_data)
-            else:
+            handler = self._handlers.get(analysis_type)
+            if handler is None:
                 return {
                     "success": False,
                     "error": f"Unknown analysis type: {analysis_type}"
                 }
             
+            return handler(audio, input_data)
+            
         except Exception as e:
             logger.error(f"Error in AudioAgent.process: {str(e)}")
             return {
@@ -142,8 +262,117 @@ class AudioAgent(BaseAgent):
                 "error": str(e)
             }
     
-    def _get_audio_path(self, input_data: Dict[str, Any]) -> Optional[str]:
-        """Get audio file path, handling various input types"""
+    async def process_multi(self, input_data: Dict[str, Any], analysis_types: List[str]) -> Dict[str, Any]:
+        """
+        Transcribe once and run several analysis types in parallel
+        
+        Args:
+            input_data: Same as process() (analysis_type is ignored)
+            analysis_types: Any of analyze, summarize, translate
+            
+        Returns:
+            {
+                "success": bool,
+                "response": str (transcript),
+                "results": dict (analysis_type -> result),
+                "metadata": dict
+            }
+        """
+        try:
+            unknown = [t for t in analysis_types if t not in TRANSCRIPT_STAGES]
+            if unknown:
+                return {
+                    "success": False,
+                    "error": f"Unknown analysis types: {', '.join(unknown)}"
+                }
+            
+            audio = self._get_audio_input(input_data)
+            
+            if audio is None:
+                return {
+                    "success": False,
+                    "error": "No audio provided or invalid audio format"
+                }
+            
+            logger.info(f"Processing audio with analysis types: {analysis_types}")
+            
+            final_state = await self.workflow.ainvoke(AudioState(
+                audio=audio,
+                input_data=input_data,
+                analysis_types=analysis_types,
+                transcript_result=None,
+                results={}
+            ))
+            
+            transcript_result = final_state["transcript_result"]
+            if not transcript_result["success"]:
+                return transcript_result
+            
+            results = final_state.get("results", {})
+            
+            return {
+                "success": all(result["success"] for result in results.values()),
+                "response": transcript_result["response"],
+                "results": results,
+                "metadata": transcript_result["metadata"]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in AudioAgent.process_multi: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _build_workflow(self) -> StateGraph:
+        """Build LangGraph workflow: one transcription fanned out to LLM stages"""
+        workflow = StateGraph(AudioState)
+        
+        workflow.add_node("transcribe", self._transcribe_node)
+        workflow.add_node("analyze", self._analyze_node)
+        workflow.add_node("summarize", self._summarize_node)
+        workflow.add_node("translate", self._translate_node)
+        
+        workflow.set_entry_point("transcribe")
+        
+        # Requested stages are async nodes in the same LangGraph step, so their
+        # OpenAI calls overlap on the event loop
+        workflow.add_conditional_edges(
+            "transcribe",
+            self._route_stages,
+            TRANSCRIPT_STAGES + [END]
+        )
+        
+        for stage in TRANSCRIPT_STAGES:
+            workflow.add_edge(stage, END)
+        
+        return workflow.compile()
+    
+    def _route_stages(self, state: AudioState):
+        """Fan out to every requested stage, or stop if transcription failed"""
+        if not state["transcript_result"]["success"]:
+            return END
+        
+        stages = [t for t in TRANSCRIPT_STAGES if t in state["analysis_types"]]
+        return stages or END
+    
+    def _transcribe_node(self, state: AudioState) -> Dict[str, Any]:
+        return {"transcript_result": self._transcribe_audio(state["audio"], state["input_data"])}
+    
+    async def _analyze_node(self, state: AudioState) -> Dict[str, Any]:
+        result = await self._arun_stage("analyze", state["transcript_result"], state["input_data"])
+        return {"results": {"analyze": result}}
+    
+    async def _summarize_node(self, state: AudioState) -> Dict[str, Any]:
+        result = await self._arun_stage("summarize", state["transcript_result"], state["input_data"])
+        return {"results": {"summarize": result}}
+    
+    async def _translate_node(self, state: AudioState) -> Dict[str, Any]:
+        result = await self._arun_stage("translate", state["transcript_result"], state["input_data"])
+        return {"results": {"translate": result}}
+    
+    def _get_audio_input(self, input_data: Dict[str, Any]) -> Optional[AudioInput]:
+        """Get audio file path or decoded samples, handling various input types"""
         try:
             # From file path
             if "audio_path" in input_data:
@@ -154,16 +383,19 @@ class AudioAgent(BaseAgent):
                     logger.error(f"Audio file not found: {path}")
                     return None
             
-            # From bytes - save to temp file
+            # From bytes - decode in memory (no temp file / ffmpeg round-trip)
             elif "audio_bytes" in input_data:
-                temp_file = tempfile.NamedTemporaryFile(
-                    delete=False,
-                    suffix=".wav"
+                if not WHISPER_AVAILABLE:
+                    logger.error("faster-whisper required to decode audio bytes")
+                    return None
+                
+                samples = decode_audio(
+                    io.BytesIO(input_data["audio_bytes"]),
+                    sampling_rate=WHISPER_SAMPLE_RATE
                 )
-                temp_file.write(input_data["audio_bytes"])
-                temp_file.close()
-                logger.info(f"Audio saved to temp file: {temp_file.name}")
-                return temp_file.name
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Decoded audio bytes: %s", self._describe_audio(samples))
+                return samples
             
             # From URL - would need to download (not implemented yet)
             elif "audio_url" in input_data:
@@ -173,11 +405,17 @@ class AudioAgent(BaseAgent):
             return None
             
         except Exception as e:
-            logger.error(f"Error getting audio path: {str(e)}")
+            logger.error(f"Error getting audio input: {str(e)}")
             return None
     
-    def _transcribe_audio(self, audio_path: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Transcribe audio using Whisper"""
+    def _describe_audio(self, audio: AudioInput) -> str:
+        """Human-readable label for logs and metadata"""
+        if isinstance(audio, np.ndarray):
+            return f"<in-memory audio, {len(audio) / WHISPER_SAMPLE_RATE:.1f}s>"
+        return audio
+    
+    def _transcribe_audio(self, audio: AudioInput, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Transcribe audio (file path or 16 kHz samples) using Whisper"""
         try:
             if not self.whisper_model:
                 return {
@@ -185,59 +423,89 @@ class AudioAgent(BaseAgent):
                     "error": "Whisper model not available"
                 }
             
-            # Check if file exists
-            if not Path(audio_path).exists():
+            # Check if file exists (decoding uses PyAV's bundled FFmpeg, so
+            # mp3/m4a/ogg no longer need a system ffmpeg)
+            if isinstance(audio, str) and not Path(audio).exists():
                 return {
                     "success": False,
-                    "error": f"Audio file not found: {audio_path}"
+                    "error": f"Audio file not found: {audio}"
                 }
             
-            # Check ffmpeg for MP3/other formats
-            file_ext = Path(audio_path).suffix.lower()
-            if file_ext in ['.mp3', '.m4a', '.aac', '.ogg'] and not self.ffmpeg_available:
-                return {
-                    "success": False,
-                    "error": f"ffmpeg required for {file_ext} files. Please ensure ffmpeg is in PATH."
-                }
+            audio_label = self._describe_audio(audio)
             
             # Get optional language
             language = input_data.get("language", None)
             
-            logger.info(f"Transcribing audio: {audio_path}")
+            # Reuse transcript if this exact audio was already transcribed
+            cache_key = self._transcript_cache_key(audio, language)
+            cached = self._transcript_cache.get(cache_key)
+            if cached:
+                logger.info("Transcript cache hit: %s", audio_label)
+                return {
+                    **cached,
+                    "metadata": {**cached["metadata"], "audio_path": audio_label, "cached": True}
+                }
+            
+            logger.info("Transcribing audio: %s", audio_label)
             
             try:
-                # Transcribe with Whisper
-                result = self.whisper_model.transcribe(
-                    audio_path,
-                    language=language,
-                    fp16=False  # Use fp32 for CPU
-                )
+                # Decode once; duration check and model both reuse the array
+                if isinstance(audio, str):
+                    audio = self._load_audio(audio)
+                
+                # Transcribe with Whisper (segments is a lazy generator)
+                if self._use_batched(audio):
+                    logger.info(f"Using batched inference (batch_size={self.batch_size})")
+                    segments, info = self.batched_model.transcribe(
+                        audio,
+                        language=language,
+                        batch_size=self.batch_size,
+                        vad_filter=True
+                    )
+                else:
+                    segments, info = self.whisper_model.transcribe(
+                        audio,
+                        language=language,
+                        beam_size=1,
+                        vad_filter=True
+                    )
+                segments = list(segments)
             except Exception as e:
                 error_msg = str(e)
-                if "ffmpeg" in error_msg.lower():
+                if "ffmpeg" in error_msg.lower() or "invalid data" in error_msg.lower():
                     return {
                         "success": False,
-                        "error": "ffmpeg error. Ensure ffmpeg is in PATH and try again."
+                        "error": f"Could not decode audio: {error_msg}"
                     }
                 raise
             
-            transcript = result["text"]
-            detected_language = result.get("language", "unknown")
+            transcript = "".join(segment.text for segment in segments).strip()
+            detected_language = info.language or "unknown"
             
-            logger.info(f"Transcription complete (language: {detected_language})")
-            logger.info(f"Transcript length: {len(transcript)} characters")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Transcription complete (language: %s, %d characters)",
+                    detected_language, len(transcript)
+                )
             
-            return {
+            result = {
                 "success": True,
                 "response": transcript,
                 "analysis_type": "transcribe",
                 "metadata": {
                     "language": detected_language,
-                    "audio_path": audio_path,
-                    "model": "whisper-base",
-                    "segments": len(result.get("segments", []))
+                    "audio_path": audio_label,
+                    "model": f"faster-whisper-{self.whisper_model_size}",
+                    # Kept (and cached) so timestamped features don't need a second Whisper pass
+                    "segments": [
+                        {"start": segment.start, "end": segment.end, "text": segment.text}
+                        for segment in segments
+                    ]
                 }
             }
+            self._transcript_cache.set(cache_key, result)
+            
+            return result
             
         except Exception as e:
             logger.error(f"Transcription failed: {str(e)}")
@@ -246,232 +514,428 @@ class AudioAgent(BaseAgent):
                 "error": str(e)
             }
     
-    def _analyze_audio(self, audio_path: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze audio content with GPT"""
+    def _transcript_cache_key(self, audio: AudioInput, language: Optional[str]) -> str:
+        """Build cache key from audio content hash, language and model size"""
+        if isinstance(audio, np.ndarray):
+            digest = hashlib.blake2b(audio.tobytes(), digest_size=16).hexdigest()
+        else:
+            # Stream in 1 MB chunks to keep memory flat for long recordings
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(audio, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+        return f"{digest}|{language or ''}|{self.whisper_model_size}"
+    
+    def _load_audio(self, audio_path: str) -> np.ndarray:
+        """Decode an audio file to 16 kHz mono float32 samples"""
+        return decode_audio(audio_path, sampling_rate=WHISPER_SAMPLE_RATE)
+    
+    def _use_batched(self, audio: np.ndarray) -> bool:
+        """Check whether audio is long enough to benefit from batched inference"""
+        if not self.batched_model:
+            return False
+        
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        return duration > self.batch_min_duration
+    
+    def _run_stage(self, stage: str, transcript_result: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one LLM stage (analyze, summarize, translate) on a transcript"""
         try:
-            # First transcribe
-            transcript_result = self._transcribe_audio(audio_path, input_data)
+            chunks = self._chunk_transcript(transcript_result)
+            
+            if len(chunks) > 1:
+                # Map: process chunks in parallel threads
+                map_requests = [
+                    self._chunk_map_request(stage, transcript_result, input_data, chunk)
+                    for chunk in chunks
+                ]
+                with ThreadPoolExecutor(max_workers=self.chunk_concurrency) as pool:
+                    partials = list(pool.map(
+                        lambda r: self._call_openai(messages=r["messages"], **r["llm_params"]),
+                        map_requests
+                    ))
+                
+                # Reduce: combine partial results
+                reduce_request = self._chunk_reduce_request(stage, transcript_result, input_data, partials)
+                if reduce_request:
+                    response = self._call_openai(
+                        messages=reduce_request["messages"], **reduce_request["llm_params"]
+                    )
+                else:
+                    response = "\n\n".join(partials)
+                
+                return self._chunked_stage_result(stage, transcript_result, input_data, response, len(chunks))
             
-            if not transcript_result["success"]:
-                return transcript_result
+            request = self._build_stage_request(stage, transcript_result, input_data)
+            response = self._call_openai(messages=request["messages"], **request["llm_params"])
+            return self._stage_result(stage, request, response)
             
-            transcript = transcript_result["response"]
+        except Exception as e:
+            logger.error(f"Audio {stage} failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def _arun_stage(self, stage: str, transcript_result: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of _run_stage (used by the LangGraph fan-out)"""
+        try:
+            chunks = self._chunk_transcript(transcript_result)
+            
+            if len(chunks) > 1:
+                # Map: process chunks concurrently, bounded by a semaphore
+                semaphore = asyncio.Semaphore(self.chunk_concurrency)
+                
+                async def run_chunk(chunk: str) -> str:
+                    request = self._chunk_map_request(stage, transcript_result, input_data, chunk)
+                    async with semaphore:
+                        return await self._acall_openai(messages=request["messages"], **request["llm_params"])
+                
+                partials = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+                
+                # Reduce: combine partial results
+                reduce_request = self._chunk_reduce_request(stage, transcript_result, input_data, partials)
+                if reduce_request:
+                    response = await self._acall_openai(
+                        messages=reduce_request["messages"], **reduce_request["llm_params"]
+                    )
+                else:
+                    response = "\n\n".join(partials)
+                
+                return self._chunked_stage_result(stage, transcript_result, input_data, response, len(chunks))
             
-            # Analyze with GPT
-            analysis_prompt = input_data.get(
-                "query",
-                "Analyze this audio transcript. Identify key topics, sentiment, and main points."
-            )
+            request = self._build_stage_request(stage, transcript_result, input_data)
+            response = await self._acall_openai(messages=request["messages"], **request["llm_params"])
+            return self._stage_result(stage, request, response)
             
-            messages = [
-                {
-                    "role": "system",
-                    "content": """You are a Meeting & Business Audio Intelligence Specialist.
+        except Exception as e:
+            logger.error(f"Audio {stage} failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _chunk_transcript(self, transcript_result: Dict[str, Any]) -> List[str]:
+        """Split a transcript into chunks of roughly max_transcript_tokens, on segment boundaries"""
+        transcript = transcript_result["response"]
+        
+        # ~0.75 words per token for English text
+        max_words = max(1, int(self.max_transcript_tokens * 0.75))
+        
+        if len(transcript.split()) <= max_words:
+            return [transcript]
+        
+        # Prefer Whisper segment boundaries so chunks don't cut sentences
+        segments = transcript_result.get("metadata", {}).get("segments")
+        if isinstance(segments, list) and segments:
+            pieces = [segment["text"].strip() for segment in segments]
+        else:
+            pieces = transcript.split()
+        
+        chunks = []
+        current = []
+        current_words = 0
+        
+        for piece in pieces:
+            piece_words = len(piece.split())
+            if current and current_words + piece_words > max_words:
+                chunks.append(" ".join(current))
+                current = []
+                current_words = 0
+            current.append(piece)
+            current_words += piece_words
+        
+        if current:
+            chunks.append(" ".join(current))
+        
+        return chunks
+    
+    def _chunk_map_request(
+        self,
+        stage: str,
+        transcript_result: Dict[str, Any],
+        input_data: Dict[str, Any],
+        chunk: str
+    ) -> Dict[str, Any]:
+        """Build the per-chunk (map) request for a long transcript"""
+        chunk_result = {**transcript_result, "response": chunk}
+        
+        # Translation is chunkable as-is; analysis/summaries condense each chunk first
+        if stage == "translate":
+            return self._translate_request(chunk_result, input_data)
+        
+        messages = [
+            {
+                "role": "system",
+                "content": """You condense one portion of a longer meeting/audio transcript.
+
+                Keep every decision, action item, owner, deadline, name, date, figure,
+                risk and open question. Drop filler and small talk."""
+            },
+            {
+                "role": "user",
+                "content": f"""Condense this transcript portion into concise notes:
+
+{chunk}"""
+            }
+        ]
+        
+        return {
+            "messages": messages,
+            "llm_params": {
+                "max_tokens": 800,
+                "reasoning_effort": "low",
+                "verbosity": "low"
+            }
+        }
+    
+    def _chunk_reduce_request(
+        self,
+        stage: str,
+        transcript_result: Dict[str, Any],
+        input_data: Dict[str, Any],
+        partials: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Build the reduce request over partial results (None when partials are simply joined)"""
+        if stage == "translate":
+            return None
+        
+        combined_result = {**transcript_result, "response": "\n\n".join(partials)}
+        return self._build_stage_request(stage, combined_result, input_data)
+    
+    def _chunked_stage_result(
+        self,
+        stage: str,
+        transcript_result: Dict[str, Any],
+        input_data: Dict[str, Any],
+        response: str,
+        chunk_count: int
+    ) -> Dict[str, Any]:
+        """Build the agent result for a map-reduced stage (metadata keeps the full transcript)"""
+        request = self._build_stage_request(stage, transcript_result, input_data)
+        request["metadata"]["chunks"] = chunk_count
+        return self._stage_result(stage, request, response)
+    
+    def _build_stage_request(self, stage: str, transcript_result: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch to the request builder for a stage"""
+        return self._stage_builders[stage](transcript_result, input_data)
+    
+    def _stage_result(self, stage: str, request: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Build the agent result for a completed stage"""
+        return {
+            "success": True,
+            "response": response,
+            "analysis_type": stage,
+            "metadata": request["metadata"]
+        }
+    
+    def _analyze_audio(self, audio: AudioInput, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze audio content with GPT"""
+        # First transcribe
+        transcript_result = self._transcribe_audio(audio, input_data)
+        
+        if not transcript_result["success"]:
+            return transcript_result
+        
+        return self._run_stage("analyze", transcript_result, input_data)
+    
+    def _analyze_request(self, transcript_result: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the GPT request for transcript analysis"""
+        transcript = transcript_result["response"]
+        
+        # Analyze with GPT (static instructions first, transcript last, so the
+        # shared prefix can be served from the prompt cache)
+        analysis_prompt = input_data.get(
+            "query",
+            "Analyze this audio transcript. Identify key topics, sentiment, and main points."
+        )
+        
+        messages = [
+            {
+                "role": "system",
+                "content": """You are a Meeting & Business Audio Intelligence Specialist.
 
-                    EXPERTISE: Extract actionable insights from meetings, calls, interviews, presentations.
+                EXPERTISE: Extract actionable insights from meetings, calls, interviews, presentations.
 
-                    FOCUS:
-                    - Action items and decisions
-                    - Key discussion points
-                    - Commitments and deadlines
-                    - Risks and concerns mentioned
-                    - Speaker roles and contributions"""
-                },
-                {
-                    "role": "user",
-                    "content": f"""MEETING/AUDIO TRANSCRIPT:
-                    {transcript}
+                FOCUS:
+                - Action items and decisions
+                - Key discussion points
+                - Commitments and deadlines
+                - Risks and concerns mentioned
+                - Speaker roles and contributions"""
+            },
+            {
+                "role": "user",
+                "content": f"""PROVIDE:
+                **Summary:** [3-5 key points]
 
-                    ANALYSIS REQUEST: {analysis_prompt}
+                **Decisions Made:**
+                - Decision 1 (timestamp, who decided)
+                - Decision 2
 
-                    PROVIDE:
-                    **Summary:** [3-5 key points]
+                **Action Items:**
+                - [ ] Task (Assigned to: X, Due: Y, Time: Z)
 
-                    **Decisions Made:**
-                    - Decision 1 (timestamp, who decided)
-                    - Decision 2
+                **Key Topics:**
+                1. Topic + depth of discussion
+                2. Topic + depth
 
-                    **Action Items:**
-                    - [ ] Task (Assigned to: X, Due: Y, Time: Z)
+                **Risks/Concerns:**
+                ⚠️ [Issues raised with context]
 
-                    **Key Topics:**
-                    1. Topic + depth of discussion
-                    2. Topic + depth
+                **Questions Needing Follow-up:**
+                - Open question 1
+                - Open question 2
 
-                    **Risks/Concerns:**
-                    ⚠️ [Issues raised with context]
+                **Overall Tone:** [collaborative/tense/productive/etc]
 
-                    **Questions Needing Follow-up:**
-                    - Open question 1
-                    - Open question 2
+                Focus on actionable business intelligence.
 
-                    **Overall Tone:** [collaborative/tense/productive/etc]
+                ANALYSIS REQUEST: {analysis_prompt}
 
-                    Focus on actionable business intelligence."""
-                }
-            ]
-            
-            response = self._call_openai(
-                messages=messages,
-                max_tokens=1000,
-                reasoning_effort="medium",
-                verbosity="medium"
-            )
-            
-            return {
-                "success": True,
-                "response": response,
-                "analysis_type": "analyze",
-                "metadata": {
-                    "transcript": transcript,
-                    "language": transcript_result["metadata"]["language"],
-                    "model": self.model
-                }
+                MEETING/AUDIO TRANSCRIPT:
+{transcript}"""
             }
-            
-        except Exception as e:
-            logger.error(f"Audio analysis failed: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
+        ]
+        
+        return {
+            "messages": messages,
+            "llm_params": {
+                "max_tokens": 1000,
+                "reasoning_effort": "medium",
+                "verbosity": "medium"
+            },
+            "metadata": {
+                "transcript": transcript,
+                "language": transcript_result["metadata"]["language"],
+                "model": self.model
             }
+        }
     
-    def _summarize_audio(self, audio_path: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _summarize_audio(self, audio: AudioInput, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Summarize audio content"""
-        try:
-            # First transcribe
-            transcript_result = self._transcribe_audio(audio_path, input_data)
-            
-            if not transcript_result["success"]:
-                return transcript_result
-            
-            transcript = transcript_result["response"]
-            
-            # Summarize with GPT
-            messages = [
-                {
-                    "role": "system",
-                    "content": """You are a Meeting Summarization Specialist.
-
-                    TASK: Create actionable meeting summaries for busy professionals.
+        # First transcribe
+        transcript_result = self._transcribe_audio(audio, input_data)
+        
+        if not transcript_result["success"]:
+            return transcript_result
+        
+        return self._run_stage("summarize", transcript_result, input_data)
+    
+    def _summarize_request(self, transcript_result: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the GPT request for transcript summarization"""
+        transcript = transcript_result["response"]
+        
+        # Summarize with GPT
+        messages = [
+            {
+                "role": "system",
+                "content": """You are a Meeting Summarization Specialist.
 
-                    FORMAT:
-                    - Executive summary (2-3 sentences)
-                    - Key decisions (what was agreed)
-                    - Action items (who, what, when)
-                    - Open questions
-                    - Next steps"""
-                },
-                {
-                    "role": "user",
-                    "content": f"""Summarize this audio transcript in 3-5 bullet points:
+                TASK: Create actionable meeting summaries for busy professionals.
 
-{transcript}
+                FORMAT:
+                - Executive summary (2-3 sentences)
+                - Key decisions (what was agreed)
+                - Action items (who, what, when)
+                - Open questions
+                - Next steps"""
+            },
+            {
+                "role": "user",
+                "content": f"""Summarize this audio transcript in 3-5 bullet points.
+Provide a clear, concise summary of the main points.
 
-Provide a clear, concise summary of the main points."""
-                }
-            ]
-            
-            response = self._call_openai(
-                messages=messages,
-                max_tokens=500,
-                reasoning_effort="low",
-                verbosity="low"
-            )
-            
-            return {
-                "success": True,
-                "response": response,
-                "analysis_type": "summarize",
-                "metadata": {
-                    "transcript": transcript,
-                    "language": transcript_result["metadata"]["language"],
-                    "model": self.model
-                }
+{transcript}"""
             }
-            
-        except Exception as e:
-            logger.error(f"Audio summarization failed: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
+        ]
+        
+        return {
+            "messages": messages,
+            "llm_params": {
+                "max_tokens": 500,
+                "reasoning_effort": "low",
+                "verbosity": "low"
+            },
+            "metadata": {
+                "transcript": transcript,
+                "language": transcript_result["metadata"]["language"],
+                "model": self.model
             }
+        }
     
-    def _translate_audio(self, audio_path: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _translate_audio(self, audio: AudioInput, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Translate audio to another language"""
-        try:
-            # First transcribe
-            transcript_result = self._transcribe_audio(audio_path, input_data)
-            
-            if not transcript_result["success"]:
-                return transcript_result
-            
-            transcript = transcript_result["response"]
-            source_language = transcript_result["metadata"]["language"]
-            target_language = input_data.get("translate_to", "English")
-            
-            # Translate with GPT
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"You are an expert translator. Translate from {source_language} to {target_language}."
-                },
-                {
-                    "role": "user",
-                    "content": f"""Translate this text to {target_language}:
-
-{transcript}
+        # First transcribe
+        transcript_result = self._transcribe_audio(audio, input_data)
+        
+        if not transcript_result["success"]:
+            return transcript_result
+        
+        return self._run_stage("translate", transcript_result, input_data)
+    
+    def _translate_request(self, transcript_result: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the GPT request for transcript translation"""
+        transcript = transcript_result["response"]
+        source_language = transcript_result["metadata"]["language"]
+        target_language = input_data.get("translate_to", "English")
+        
+        # Translate with GPT
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert translator. Provide only the translation, maintaining the original meaning and tone."
+            },
+            {
+                "role": "user",
+                "content": f"""Translate this text from {source_language} to {target_language}:
 
-Provide only the translation, maintaining the original meaning and tone."""
-                }
-            ]
-            
-            response = self._call_openai(
-                messages=messages,
-                max_tokens=2000,
-                reasoning_effort="medium",
-                verbosity="low"
-            )
-            
-            return {
-                "success": True,
-                "response": response,
-                "analysis_type": "translate",
-                "metadata": {
-                    "original_transcript": transcript,
-                    "source_language": source_language,
-                    "target_language": target_language,
-                    "model": self.model
-                }
+{transcript}"""
             }
-            
-        except Exception as e:
-            logger.error(f"Audio translation failed: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
+        ]
+        
+        return {
+            "messages": messages,
+            "llm_params": {
+                "max_tokens": 2000,
+                "reasoning_effort": "medium",
+                "verbosity": "low"
+            },
+            "metadata": {
+                "original_transcript": transcript,
+                "source_language": source_language,
+                "target_language": target_language,
+                "model": self.model
             }
+        }
     
     def get_audio_info(self, audio_path: str) -> Dict[str, Any]:
-        """Get audio file information"""
+        """Get audio file information (reads the header only, no full decode)"""
         try:
-            if not PYDUB_AVAILABLE:
+            info = None
+            
+            if SOUNDFILE_AVAILABLE:
+                try:
+                    info = self._read_info_soundfile(audio_path)
+                except Exception as e:
+                    # libsndfile doesn't handle some containers (mp4/m4a/aac)
+                    logger.debug(f"soundfile could not read {audio_path}: {e}")
+            
+            if info is None:
+                info = self._read_info_ffprobe(audio_path)
+            
+            if info is None:
                 return {
                     "success": False,
-                    "error": "pydub not available"
+                    "error": "Unable to read audio info (soundfile and ffprobe unavailable or failed)"
                 }
             
-            audio = AudioSegment.from_file(audio_path)
+            info["file_size_mb"] = os.path.getsize(audio_path) / (1024 * 1024)
             
             return {
                 "success": True,
-                "info": {
-                    "duration_seconds": len(audio) / 1000.0,
-                    "channels": audio.channels,
-                    "sample_width": audio.sample_width,
-                    "frame_rate": audio.frame_rate,
-                    "file_size_mb": os.path.getsize(audio_path) / (1024 * 1024)
-                }
+                "info": info
             }
             
         except Exception as e:
@@ -480,7 +944,65 @@ Provide only the translation, maintaining the original meaning and tone."""
                 "success": False,
                 "error": str(e)
             }
+    
+    def _read_info_soundfile(self, audio_path: str) -> Dict[str, Any]:
+        """Read audio header with libsndfile"""
+        info = soundfile.info(audio_path)
+        
+        return {
+            "duration_seconds": info.duration,
+            "channels": info.channels,
+            "sample_width": SOUNDFILE_SAMPLE_WIDTHS.get(info.subtype),
+            "frame_rate": info.samplerate
+        }
+    
+    def _read_info_ffprobe(self, audio_path: str) -> Optional[Dict[str, Any]]:
+        """Read audio container/stream metadata with ffprobe"""
+        if not FFPROBE_PATH:
+            return None
+        
+        result = subprocess.run(
+            [
+                FFPROBE_PATH, "-v", "error",
+                "-show_format", "-show_streams",
+                "-print_format", "json",
+                audio_path
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        
+        if result.returncode != 0:
+            logger.warning(f"ffprobe failed for {audio_path}: {result.stderr.strip()}")
+            return None
+        
+        probe = json.loads(result.stdout)
+        stream = next(
+            (s for s in probe.get("streams", []) if s.get("codec_type") == "audio"),
+            {}
+        )
+        bits = stream.get("bits_per_sample") or stream.get("bits_per_raw_sample")
+        
+        return {
+            "duration_seconds": float(probe.get("format", {}).get("duration", 0.0)),
+            "channels": stream.get("channels"),
+            "sample_width": int(bits) // 8 if bits else None,
+            "frame_rate": int(stream.get("sample_rate", 0))
+        }
+
+
+# Global instance (constructed on first access, see PEP 562)
+_audio_agent = None
+_audio_agent_lock = threading.Lock()
 
 
-# Global instance
-audio_agent = AudioAgent()
\ No newline at end of file
+def __getattr__(name: str):
+    if name == "audio_agent":
+        global _audio_agent
+        if _audio_agent is None:
+            with _audio_agent_lock:
+                if _audio_agent is None:
+                    _audio_agent = AudioAgent()
+        return _audio_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
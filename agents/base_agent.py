@@ -5,9 +5,11 @@ Abstract class that all specialized agents inherit from
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from config.settings import settings
+from utils.http_client import async_openai_client, get_http_client
 from utils.logger import logger
+from utils.retry import aopenai_retry, openai_retry
 
 
 class BaseAgent(ABC):
@@ -26,11 +28,20 @@ class BaseAgent(ABC):
         self.model = settings.get('llm.model_name', 'gpt-5-mini')
         self.max_tokens = settings.get('llm.max_tokens', 2000)
         
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        # Initialize OpenAI client over the shared connection pool (aclient is its async
+        # counterpart); retries are handled by openai_retry, so the SDK's own retries are off
+        self.client = OpenAI(api_key=settings.openai_api_key, max_retries=0, http_client=get_http_client())
+        
+        # Built once so every call sends a byte-identical prefix (prompt caching)
+        self._system_msg = {"role": "system", "content": self._build_system_prompt()}
         
         logger.info(f"Initialized {self.name} agent with model: {self.model}")
     
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Async OpenAI client for the running event loop (shared by all agents)"""
+        return async_openai_client()
+    
     @abstractmethod
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -68,64 +79,120 @@ class BaseAgent(ABC):
             Response text from OpenAI
         """
         try:
-            params = {
-                "model": self.model,
-                "messages": messages,
-                "store": False
-            }
-            
-            # GPT-5 and reasoning models (o1, o3) configuration
-            if "gpt-5" in self.model.lower() or "o1" in self.model.lower() or "o3" in self.model.lower():
-                # Use max_completion_tokens for reasoning models
-                params["max_completion_tokens"] = max_tokens or self.max_tokens
-                params["verbosity"] = verbosity
-                params["reasoning_effort"] = reasoning_effort
-                # Note: GPT-5/reasoning models don't support temperature
-                
-            else:
-                # Older models (GPT-4, GPT-3.5) use max_tokens
-                params["max_tokens"] = max_tokens or self.max_tokens
-                # Only add temperature for non-reasoning models
-                if temperature is not None:
-                    params["temperature"] = temperature
-            
-            # Add response format if specified
-            if response_format:
-                params["response_format"] = response_format
+            params = self._build_params(
+                messages, response_format, verbosity, reasoning_effort, max_tokens, temperature
+            )
             
             # Make API call
-            response = self.client.chat.completions.create(**params)
-            
-            # Check finish reason for token limit issues
-            finish_reason = response.choices[0].finish_reason
-            if finish_reason == "length":
-                logger.warning(
-                    f"{self.name}: Response truncated due to token limit. "
-                    f"Consider increasing max_tokens (current: {max_tokens or self.max_tokens})"
-                )
+            response = openai_retry(self.client.chat.completions.create)(**params)
             
-            result = response.choices[0].message.content
-            
-            logger.info(f"{self.name} processed request successfully with {self.model}")
-            return result
+            return self._parse_response(response, max_tokens)
             
         except Exception as e:
-            error_msg = str(e)
+            self._handle_openai_error(e)
+            raise
+    
+    async def _acall_openai(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Dict[str, str]] = None,
+        verbosity: str = "medium",
+        reasoning_effort: str = "medium",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> str:
+        """
+        Async version of _call_openai
+        
+        Use this from async code (e.g. LangGraph async nodes) so the event loop
+        is not blocked, and asyncio.gather independent calls to overlap them.
+        Arguments and return value are the same as _call_openai.
+        """
+        try:
+            params = self._build_params(
+                messages, response_format, verbosity, reasoning_effort, max_tokens, temperature
+            )
             
-            # Handle specific OpenAI errors
-            if "max_tokens" in error_msg.lower() or "token limit" in error_msg.lower():
-                logger.error(f"{self.name}: Token limit exceeded. Try reducing input size or increasing max_tokens.")
-                raise Exception(
-                    "Response too long. Please try a shorter query or break it into multiple requests."
-                )
+            # Make API call
+            response = await aopenai_retry(self.aclient.chat.completions.create)(**params)
             
-            if "temperature" in error_msg.lower() and "gpt-5" in self.model.lower():
-                logger.error(f"{self.name}: GPT-5 models don't support temperature parameter.")
-                raise Exception("Model configuration error. Please check model parameters.")
+            return self._parse_response(response, max_tokens)
             
-            logger.error(f"Error in {self.name} OpenAI call: {error_msg}")
+        except Exception as e:
+            self._handle_openai_error(e)
             raise
     
+    def _build_params(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Dict[str, str]],
+        verbosity: str,
+        reasoning_effort: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float]
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters for the configured model"""
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "store": False,
+            # Route this agent's requests to the same prompt cache bucket
+            "prompt_cache_key": self.name
+        }
+        
+        # GPT-5 and reasoning models (o1, o3) configuration
+        if "gpt-5" in self.model.lower() or "o1" in self.model.lower() or "o3" in self.model.lower():
+            # Use max_completion_tokens for reasoning models
+            params["max_completion_tokens"] = max_tokens or self.max_tokens
+            params["verbosity"] = verbosity
+            params["reasoning_effort"] = reasoning_effort
+            # Note: GPT-5/reasoning models don't support temperature
+            
+        else:
+            # Older models (GPT-4, GPT-3.5) use max_tokens
+            params["max_tokens"] = max_tokens or self.max_tokens
+            # Only add temperature for non-reasoning models
+            if temperature is not None:
+                params["temperature"] = temperature
+        
+        # Add response format if specified
+        if response_format:
+            params["response_format"] = response_format
+        
+        return params
+    
+    def _parse_response(self, response: Any, max_tokens: Optional[int]) -> str:
+        """Extract response text and warn on truncation"""
+        # Check finish reason for token limit issues
+        finish_reason = response.choices[0].finish_reason
+        if finish_reason == "length":
+            logger.warning(
+                f"{self.name}: Response truncated due to token limit. "
+                f"Consider increasing max_tokens (current: {max_tokens or self.max_tokens})"
+            )
+        
+        result = response.choices[0].message.content
+        
+        logger.info("%s processed request successfully with %s", self.name, self.model)
+        return result
+    
+    def _handle_openai_error(self, error: Exception):
+        """Translate known OpenAI errors; returns normally for errors that should be re-raised"""
+        error_msg = str(error)
+        
+        # Handle specific OpenAI errors
+        if "max_tokens" in error_msg.lower() or "token limit" in error_msg.lower():
+            logger.error(f"{self.name}: Token limit exceeded. Try reducing input size or increasing max_tokens.")
+            raise Exception(
+                "Response too long. Please try a shorter query or break it into multiple requests."
+            )
+        
+        if "temperature" in error_msg.lower() and "gpt-5" in self.model.lower():
+            logger.error(f"{self.name}: GPT-5 models don't support temperature parameter.")
+            raise Exception("Model configuration error. Please check model parameters.")
+        
+        logger.error(f"Error in {self.name} OpenAI call: {error_msg}")
+    
     def _build_system_prompt(self) -> str:
         """
         Build system prompt for the agent
@@ -3,17 +3,39 @@ Image Agent for AURA - Enhanced with Multi-Engine OCR
 Handles image analysis, OCR, and visual understanding
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
+import asyncio
 import base64
+import hashlib
+import mmap
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from agents.base_agent import BaseAgent
+from config.settings import settings
+from utils.cache import PersistentLRUCache
 from utils.logger import logger
+from utils.retry import aopenai_retry, openai_retry
 from PIL import Image
 import io
 import cv2
 import numpy as np
 
+# Fast non-cryptographic hashing for cache keys (falls back to blake2b)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 # OCR engines
+# Tesseract's internal OpenMP threading is slower than running images in parallel
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 try:
     import pytesseract
     TESSERACT_AVAILABLE = True
@@ -22,6 +44,147 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     logger.warning("pytesseract not available - install with: pip install pytesseract")
 
+# SIMD base64 for vision payloads (falls back to stdlib)
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+# In-process Tesseract API (keeps the model loaded instead of spawning tesseract per call)
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# Image file path, encoded image bytes, or already decoded grayscale pixels
+ImageInput = Union[str, bytes, np.ndarray]
+
+# Bump when OCR prompts or preprocessing change so stale cached results are ignored
+OCR_CACHE_VERSION = 9
+
+# Batches larger than this share one Tesseract process (list-of-images input)
+TESSERACT_BATCH_MIN = 4
+# Images per Tesseract invocation; very long lists can stall Tesseract
+TESSERACT_BATCH_SIZE = 50
+
+# Long-edge bounds (px) for OCR input; outside them images are resized before Tesseract
+OCR_MAX_EDGE = 2000
+OCR_MIN_EDGE = 800
+
+# Tesseract confidence below which ocr_engine "all" escalates to GPT Vision
+GPT_FALLBACK_CONFIDENCE = 70
+
+# Cheap first OCR pass: long edge for the downscaled tier-1 run, and the
+# confidence that accepts it without a full-resolution pass
+OCR_FAST_EDGE = 1000
+OCR_FAST_CONFIDENCE = 80
+
+# Row-brightness standard deviation above which adaptive thresholding replaces Otsu
+UNEVEN_LIGHTING_STD = 15
+
+# Images with a dominant background peak and strong contrast (screenshots, rendered
+# pages) are already clean, so denoising is skipped
+CLEAN_BACKGROUND_SHARE = 0.3
+CLEAN_MIN_STD = 60
+
+# Deskew only images below this many pixels, and only when skew exceeds DESKEW_MIN_ANGLE degrees
+DESKEW_MAX_PIXELS = 4_000_000
+DESKEW_MIN_ANGLE = 0.5
+
+# Images sent to GPT Vision are re-encoded as JPEG within this long edge
+VISION_MAX_EDGE = 2048
+VISION_JPEG_QUALITY = 85
+
+# White rows between stacked crops in region and composite OCR
+REGION_SEPARATOR = 20
+
+# Batch images up to this many pixels are stacked into composites of at most this height
+COMPOSITE_MAX_PIXELS = 500_000
+COMPOSITE_MAX_HEIGHT = 8000
+
+# Images above this many pixels are OCR'd as overlapping tiles (Tesseract does best on page-sized crops)
+TESSERACT_TILE_MAX_PIXELS = 2_000_000
+TESSERACT_TILE_SIZE = (800, 1100)  # width, height
+TESSERACT_TILE_OVERLAP = 0.1
+TESSERACT_TILE_WORKERS = 4
+
+
+# Static GPT Vision prompts, built once (dedented to avoid billing indentation tokens)
+OCR_PROMPT = """DOCUMENT OCR EXTRACTION
+
+TASK: Extract ALL text from this document image with business-document precision.
+
+REQUIREMENTS:
+1. Extract every word, number, and symbol
+2. Preserve formatting (line breaks, spacing, structure)
+3. Identify document structure (headers, sections, tables)
+4. Flag uncertain text with [?]
+5. Note any missing or illegible sections
+
+OUTPUT FORMAT:
+**Document Type:** [type]
+
+**Full Text:**
+[Complete extracted text with formatting preserved]
+
+**Structured Data:**
+- Date(s): [if present]
+- ID/Reference Numbers: [if present]
+- Amounts/Prices: [if present]
+- Parties/Names: [if present]
+
+**Tables** (if present):
+[Table data in structured format]
+
+**OCR Quality:** [confidence level]
+**Issues:** [any unclear sections]
+
+Be thorough - every word matters for document intelligence."""
+
+DESCRIBE_PROMPT = """Document Image Analysis:
+
+TASK: Identify and describe this document image for business intelligence.
+
+OUTPUT:
+**Document Type:** [invoice/contract/receipt/form/report/letter/diagram/other]
+
+**Key Visual Elements:**
+- Headers/Titles: [text]
+- Logos/Branding: [if present]
+- Layout: [single/multi-column, form, table, freeform]
+- Notable Features: [stamps, signatures, barcodes]
+
+**Text Preview:** [sample of visible text]
+
+**Quality Assessment:**
+- Scan Quality: [excellent/good/poor]
+- Readability: [clear/moderate/difficult]
+- Issues: [blur, skew, shadows, missing parts]
+
+**Recommended Action:** [OCR/manual entry/rescan]
+
+Focus on document characteristics, not artistic description."""
+
+ANALYZE_PROMPT = """Deep Document Analysis:
+
+ANALYZE this document image for:
+1. Document Type & Purpose
+2. Key Information (dates, amounts, parties, terms)
+3. Document Structure (sections, clauses, fields)
+4. Legal/Financial Elements (signatures, totals, terms)
+5. Completeness (missing fields, stamps, signatures)
+6. Risks/Flags (anomalies, inconsistencies, concerns)
+
+Provide business intelligence, not just description."""
+
+# Prebuilt text content blocks (the SDK serializes without mutating them)
+_TEXT_BLOCKS = {
+    "ocr": {"type": "text", "text": OCR_PROMPT},
+    "describe": {"type": "text", "text": DESCRIBE_PROMPT}
+}
+
 
 class ImageAgent(BaseAgent):
     """Agent specialized in image processing with multi-engine OCR"""
@@ -33,6 +196,15 @@ class ImageAgent(BaseAgent):
         )
         self.vision_model = "gpt-5-mini"
         
+        # Fixed vision call parameters (messages added per call)
+        self._vision_params = {
+            "model": self.vision_model,
+            "store": False,
+            "max_completion_tokens": 1000,
+            "verbosity": "medium",
+            "reasoning_effort": "medium"
+        }
+        
         # Set Tesseract path directly (Windows PATH too long)
         if TESSERACT_AVAILABLE:
             import pytesseract
@@ -42,6 +214,31 @@ class ImageAgent(BaseAgent):
         # Initialize OCR engines
         self._init_ocr_engines()
         
+        # Overlap GPT Vision with Tesseract for OCR requests using both engines
+        self.speculative_gpt = settings.get('image.speculative_gpt', True)
+        self._speculation_executor = ThreadPoolExecutor(max_workers=4)
+        
+        # Tesseract language model(s), e.g. "eng" or "eng+deu"
+        self.tesseract_lang = settings.get('image.tesseract_lang', 'eng')
+        
+        # Pool of tesserocr APIs (PyTessBaseAPI is not thread-safe), each borrowed by one
+        # thread at a time; models are loaded on demand, at most one per batch worker
+        self._tess_pool: "queue.Queue[PyTessBaseAPI]" = queue.Queue()
+        self._tess_apis: List["PyTessBaseAPI"] = []
+        self._tess_max_apis = settings.get('image.batch_workers') or os.cpu_count() or 1
+        self._tess_lock = threading.Lock()
+        
+        # Per-thread preprocessing state: scratch buffers and the contrast equalizer
+        # (CLAHE rewrites internal buffers on apply, so it can't be shared across threads)
+        self._scratch_local = threading.local()
+        self.denoise = settings.get('image.denoise', 'median')
+        
+        # OCR results keyed by image content hash, engine and OCR_CACHE_VERSION
+        self._ocr_cache = PersistentLRUCache(
+            "ocr_results",
+            max_entries=settings.get('image.ocr_cache_size', 256)
+        )
+        
         logger.info(f"Image Agent initialized with vision model: {self.vision_model}")
     
     def _init_ocr_engines(self):
@@ -68,7 +265,9 @@ class ImageAgent(BaseAgent):
                 "image_bytes": bytes,
                 "query": str,
                 "analysis_type": str (describe, ocr, analyze, question),
-                "ocr_engine": str (tesseract, gpt_vision, all)
+                "ocr_engine": str (tesseract, gpt_vision, all),
+                "regions": list of (x, y, w, h) boxes to OCR separately (optional, ocr only),
+                "image_kind": str (screenshot, photo, scan; optional, skips the clean-image check)
             }
             
         Returns:
@@ -94,7 +293,9 @@ class ImageAgent(BaseAgent):
             logger.info(f"Processing image with analysis type: {analysis_type}")
             
             # Route to appropriate method
-            if analysis_type == "ocr":
+            if analysis_type == "ocr" and input_data.get("regions"):
+                return self._process_ocr_regions(image_data, input_data["regions"])
+            elif analysis_type == "ocr":
                 return self._process_ocr_advanced(image_data, input_data)
             elif analysis_type == "describe":
                 return self._describe_image(image_data)
@@ -121,16 +322,12 @@ class ImageAgent(BaseAgent):
                     logger.error(f"Image not found: {path}")
                     return None
                 
-                with open(path, "rb") as f:
-                    image_bytes = f.read()
-                
-                base64_image = base64.b64encode(image_bytes).decode('utf-8')
-                
+                # Only the path and content hash are kept; Tesseract reads the file itself
+                # and GPT Vision reads it lazily when building the data URL
                 return {
                     "type": "file",
-                    "base64": base64_image,
                     "path": str(path),
-                    "bytes": image_bytes
+                    "hash": self._file_hash(path)
                 }
             
             # From URL
@@ -142,11 +339,10 @@ class ImageAgent(BaseAgent):
             
             # From bytes
             elif "image_bytes" in input_data:
-                base64_image = base64.b64encode(input_data["image_bytes"]).decode('utf-8')
                 return {
                     "type": "bytes",
-                    "base64": base64_image,
-                    "bytes": input_data["image_bytes"]
+                    "bytes": input_data["image_bytes"],
+                    "hash": self._image_hash(input_data["image_bytes"])
                 }
             
             return None
@@ -155,38 +351,356 @@ class ImageAgent(BaseAgent):
             logger.error(f"Error getting image data: {str(e)}")
             return None
     
-    def _preprocess_image(self, image_path: str) -> np.ndarray:
-        """Preprocess image for better OCR"""
+    def _new_hasher(self):
+        """128-bit hasher for OCR cache keys (xxh3 when available)"""
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_128()
+        return hashlib.blake2b(digest_size=16)
+    
+    def _image_hash(self, image_bytes: bytes) -> str:
+        """Content hash used as the OCR cache key"""
+        hasher = self._new_hasher()
+        hasher.update(image_bytes)
+        return hasher.hexdigest()
+    
+    def _file_hash(self, path: Path) -> str:
+        """Content hash of an image file, memory-mapped so it isn't copied into Python"""
+        hasher = self._new_hasher()
+        with open(path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+            except ValueError:
+                # Empty files can't be mapped
+                pass
+        return hasher.hexdigest()
+    
+    def _ocr_cache_key(self, image_data: Dict[str, Any], engine: str) -> Optional[str]:
+        """Build OCR cache key, or None for images without content (URLs)"""
+        image_hash = image_data.get("hash")
+        if not image_hash:
+            return None
+        return f"{image_hash}|{engine}|{self.tesseract_lang}|v{OCR_CACHE_VERSION}"
+    
+    def _cached_ocr(self, image_data: Dict[str, Any], engine: str, run) -> Dict[str, Any]:
+        """
+        Run a single OCR engine through the cache
+        
+        Args:
+            image_data: Image data from _get_image_data
+            engine: Engine name used in the cache key
+            run: Callable returning the engine result on a miss
+            
+        Returns:
+            Engine result dictionary
+        """
+        cache_key = self._ocr_cache_key(image_data, engine)
+        
+        if cache_key:
+            cached = self._ocr_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"OCR cache hit ({engine})")
+                return cached
+        
+        result = run()
+        
+        # Don't cache failures so they are retried
+        if cache_key and not result.get("error"):
+            self._ocr_cache.set(cache_key, result)
+        
+        return result
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of process
+        
+        GPT Vision requests await the async client; OCR (CPU-bound Tesseract
+        plus its own GPT fallback) runs in a worker thread.
+        """
+        analysis_type = input_data.get("analysis_type", "describe")
+        
+        if analysis_type == "ocr":
+            return await asyncio.to_thread(self.process, input_data)
+        
+        try:
+            query = input_data.get("query", "")
+            
+            if analysis_type not in ("describe", "analyze", "question"):
+                return {"success": False, "error": f"Unknown analysis type: {analysis_type}"}
+            if analysis_type == "question" and not query:
+                return {"success": False, "error": "Query required"}
+            
+            image_data = await asyncio.to_thread(self._get_image_data, input_data)
+            if not image_data:
+                return {
+                    "success": False,
+                    "error": "No image provided"
+                }
+            
+            logger.info(f"Processing image with analysis type: {analysis_type}")
+            return await self._arun_vision(analysis_type, image_data, query)
+            
+        except Exception as e:
+            logger.error(f"Error in ImageAgent.aprocess: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process multiple images in parallel
+        
+        Args:
+            inputs: List of input_data dictionaries (same format as process)
+            
+        Returns:
+            List of response dictionaries, in input order
+        """
+        if not inputs:
+            return []
+        
+        # Large batches: OCR all Tesseract work in a few Tesseract runs, then hit the cache below
+        if len(inputs) > TESSERACT_BATCH_MIN and TESSERACT_AVAILABLE:
+            self._prefetch_tesseract(inputs)
+        
+        max_workers = min(len(inputs), settings.get('image.batch_workers') or os.cpu_count() or 1)
+        
+        # pytesseract runs Tesseract as a subprocess, so threads give process-level parallelism
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.process, inputs))
+        
+        logger.info(f"Processed batch of {len(inputs)} images")
+        return results
+    
+    def _prefetch_tesseract(self, inputs: List[Dict[str, Any]]):
+        """Batch-OCR uncached Tesseract work for a batch and store results in the OCR cache"""
+        pending = {}
+        
+        for input_data in inputs:
+            if input_data.get("analysis_type") != "ocr":
+                continue
+            if input_data.get("ocr_engine", "all") not in ("all", "tesseract"):
+                continue
+            if "image_path" not in input_data:
+                continue
+            
+            path = Path(input_data["image_path"])
+            if not path.exists():
+                continue
+            
+            cache_key = self._ocr_cache_key({"hash": self._file_hash(path)}, "tesseract")
+            if cache_key not in pending and self._ocr_cache.get(cache_key) is None:
+                pending[cache_key] = str(path)
+        
+        if not pending:
+            return
+        
+        results = self._ocr_tesseract_batch(list(pending.values()))
+        
+        for cache_key, result in zip(pending, results):
+            if not result.get("error"):
+                self._ocr_cache.set(cache_key, result)
+    
+    def _read_grayscale(self, image: ImageInput) -> np.ndarray:
+        """Decode an image file path or encoded bytes straight to grayscale (ndarrays pass through)"""
+        if isinstance(image, np.ndarray):
+            return image
+        # No separate BGR->gray conversion; in-memory images are decoded without touching disk
+        if isinstance(image, str):
+            return cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+        return cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    
+    def _ocr_source(self, image_data: Dict[str, Any]) -> np.ndarray:
+        """Decode the image once per request and share it across OCR tiers"""
+        if "gray" not in image_data:
+            image_data["gray"] = self._read_grayscale(image_data.get("path") or image_data.get("bytes"))
+        return image_data["gray"]
+    
+    def _preprocess_image(
+        self,
+        image: ImageInput,
+        max_edge: int = OCR_MAX_EDGE,
+        image_kind: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Preprocess image (path, bytes or grayscale ndarray) for better OCR
+        
+        Args:
+            image: Image file path, encoded bytes or grayscale ndarray
+            max_edge: Long-edge cap
+            image_kind: "screenshot", "photo" or "scan" hint; None detects clean images
+        """
+        gray = self._read_grayscale(image)
+        
         try:
-            # Read image
-            img = cv2.imread(image_path)
+            # Rescale toward Tesseract's preferred text size: shrink huge captures, enlarge tiny ones
+            long_edge = max(gray.shape[:2])
+            if long_edge > max_edge:
+                scale = max_edge / long_edge
+                gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            elif long_edge < OCR_MIN_EDGE:
+                scale = min(2, max_edge / long_edge)
+                gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
             
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            # Even out lighting (much cheaper than non-local means denoising)
+            # (intermediates go into per-thread scratch buffers; only the result is allocated)
+            enhanced = self._clahe().apply(gray, dst=self._scratch("enhanced", gray.shape))
             
-            # Denoise
-            denoised = cv2.fastNlMeansDenoising(gray)
+            # Optional light denoise (median is ~10-50x cheaper than non-local means);
+            # clean screenshots and rendered pages gain nothing from it
+            if self._is_clean_image(gray, image_kind):
+                pass
+            elif self.denoise == "median":
+                enhanced = cv2.medianBlur(enhanced, 3, dst=self._scratch("denoised", gray.shape))
+            elif self.denoise == "nlmeans":
+                enhanced = cv2.fastNlMeansDenoising(enhanced)
             
-            # Threshold
-            _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            # Threshold: a single global (Otsu) threshold loses text under uneven lighting,
+            # detected as large variation in brightness between rows
+            row_means = cv2.reduce(gray, 1, cv2.REDUCE_AVG, dtype=cv2.CV_32F)
+            if float(row_means.std()) > UNEVEN_LIGHTING_STD:
+                thresh = cv2.adaptiveThreshold(
+                    enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+                )
+            else:
+                _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            
+            # Straighten slightly rotated captures (Tesseract expects horizontal baselines)
+            if thresh.size < DESKEW_MAX_PIXELS:
+                thresh = self._deskew(thresh)
             
             logger.info("Image preprocessed for OCR")
             return thresh
             
         except Exception as e:
             logger.warning(f"Preprocessing failed: {e}, using original")
-            return cv2.imread(image_path)
+            return gray
+    
+    def _is_clean_image(self, gray: np.ndarray, image_kind: Optional[str] = None) -> bool:
+        """Check whether an image is already clean (bimodal, high contrast) and needs no denoise"""
+        if image_kind:
+            return image_kind == "screenshot"
+        
+        hist = cv2.calcHist([gray], [0], None, [256], [0, 256])
+        background_share = float(hist.max()) / gray.size
+        return background_share > CLEAN_BACKGROUND_SHARE and float(gray.std()) > CLEAN_MIN_STD
+    
+    def _scratch(self, name: str, shape: tuple) -> np.ndarray:
+        """
+        Get a reusable uint8 buffer for this thread
+        
+        Buffers are reused while consecutive images share a shape. They must not
+        escape preprocessing (results returned to callers are freshly allocated).
+        """
+        buffers = getattr(self._scratch_local, "buffers", None)
+        if buffers is None:
+            buffers = self._scratch_local.buffers = {}
+        
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buffer
+    
+    def _clahe(self) -> "cv2.CLAHE":
+        """Contrast equalizer for OCR preprocessing, one per thread (created on first use)"""
+        clahe = getattr(self._scratch_local, "clahe", None)
+        if clahe is None:
+            clahe = self._scratch_local.clahe = cv2.createCLAHE(clipLimit=1.0, tileGridSize=(8, 8))
+        return clahe
+    
+    def _deskew(self, thresh: np.ndarray) -> np.ndarray:
+        """Rotate a binarized image so the text block's minimum-area rectangle is level"""
+        # Text is dark on a light background after thresholding
+        coords = cv2.findNonZero(cv2.bitwise_not(thresh, dst=self._scratch("inverted", thresh.shape)))
+        if coords is None or len(coords) < 10:
+            return thresh
+        
+        # minAreaRect's angle range differs between OpenCV versions; normalize to (-45, 45]
+        angle = cv2.minAreaRect(coords)[-1]
+        while angle > 45:
+            angle -= 90
+        while angle <= -45:
+            angle += 90
+        
+        if abs(angle) <= DESKEW_MIN_ANGLE:
+            return thresh
+        
+        h, w = thresh.shape[:2]
+        matrix = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+        
+        logger.info(f"Deskewed image by {angle:.2f} degrees")
+        return cv2.warpAffine(
+            thresh, matrix, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE
+        )
     
     def _process_ocr_advanced(self, image_data: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Advanced OCR with Tesseract primary, GPT Vision fallback"""
         try:
             ocr_engine = input_data.get("ocr_engine", "all")
+            image_data["image_kind"] = input_data.get("image_kind")
+            
+            # Repeat requests for the same image skip OCR entirely
+            cache_key = self._ocr_cache_key(image_data, f"combined:{ocr_engine}")
+            if cache_key:
+                cached = self._ocr_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("OCR cache hit")
+                    # Copy so callers can't mutate the cached entry
+                    return {**cached, "metadata": {**cached["metadata"], "cached": True}}
+            
             results = {}
             
-            # Priority 1: Tesseract (local, fast, free)
+            gpt_future = None
+            # Full-resolution preprocessed image, also sent to GPT Vision instead of the upload
+            processed = None
+            ocr_tier = 0
+            
+            # Priority 1: Tesseract (local, fast, free), cheapest tier first:
+            #   tier 1 - Tesseract on a downscaled image, accepted if confident
+            #   tier 2 - Tesseract at full OCR resolution
+            #   tier 3 - GPT Vision, only if tier 2 is still unconfident
             if (ocr_engine == "all" or ocr_engine == "tesseract") and TESSERACT_AVAILABLE:
-                if image_data.get("path"):
-                    tesseract_result = self._ocr_tesseract(image_data["path"])
+                if image_data.get("path") or image_data.get("bytes"):
+                    tesseract_result = None
+                    full_key = self._ocr_cache_key(image_data, "tesseract")
+                    
+                    # Full-resolution result already paid for (e.g. by process_batch)
+                    if full_key:
+                        tesseract_result = self._ocr_cache.get(full_key)
+                        ocr_tier = 2
+                    
+                    if tesseract_result is None:
+                        fast_result = self._cached_ocr(
+                            image_data, "tesseract_fast",
+                            lambda: self._ocr_tesseract(
+                                self._ocr_source(image_data), max_edge=OCR_FAST_EDGE,
+                                image_kind=image_data["image_kind"]
+                            )
+                        )
+                        
+                        if fast_result.get("confidence", 0) >= OCR_FAST_CONFIDENCE:
+                            tesseract_result = fast_result
+                            ocr_tier = 1
+                    
+                    if tesseract_result is None:
+                        # Preprocessed here, before the speculative call starts, so both tiers
+                        # get the same array and nothing is shared through image_data
+                        processed = self._preprocess_image(
+                            self._ocr_source(image_data), image_kind=image_data["image_kind"]
+                        )
+                        
+                        # Start GPT Vision speculatively so it overlaps tier 2; its result is only
+                        # used if tier 2 is unconfident (and is cached either way)
+                        if self.speculative_gpt and ocr_engine == "all":
+                            gpt_future = self._speculation_executor.submit(
+                                self._cached_ocr, image_data, "gpt_vision",
+                                lambda: self._ocr_gpt_vision(image_data, processed)
+                            )
+                        
+                        tesseract_result = self._cached_ocr(
+                            image_data, "tesseract",
+                            lambda: self._ocr_tesseract(processed, preprocessed=True)
+                        )
+                        ocr_tier = 2
+                    
                     confidence = tesseract_result.get("confidence", 0)
                     
                     # Use Tesseract if confidence > 60%
@@ -213,21 +727,38 @@ class ImageAgent(BaseAgent):
             elif len(results) == 0:
                 use_gpt = True
                 logger.info("Tesseract failed - using GPT Vision fallback")
-            elif results.get("tesseract", {}).get("confidence", 0) < 70:
+            elif ocr_engine == "all" and results["tesseract"].get("confidence", 0) < GPT_FALLBACK_CONFIDENCE:
+                # Explicit ocr_engine="tesseract" requests are never upgraded to a billed GPT call
                 use_gpt = True
                 logger.info("Tesseract low confidence - using GPT Vision for validation")
             
             if use_gpt:
-                gpt_result = self._ocr_gpt_vision(image_data)
+                ocr_tier = 3
+                if gpt_future:
+                    gpt_result = gpt_future.result()
+                else:
+                    gpt_result = self._cached_ocr(
+                        image_data, "gpt_vision",
+                        lambda: self._ocr_gpt_vision(image_data, processed)
+                    )
                 results["gpt_vision"] = gpt_result
+            elif gpt_future:
+                # Not needed; drop it if it hasn't started yet
+                gpt_future.cancel()
             
             if len(results) == 0:
                 return {"success": False, "error": "No OCR engines available"}
             
+            # Escalation rate metric
+            logger.info(
+                "ocr_tier_used=%d, conf=%.1f",
+                ocr_tier, results.get("tesseract", {}).get("confidence", 0)
+            )
+            
             # Smart combination
             combined_text = self._combine_ocr_smart(results)
             
-            return {
+            result = {
                 "success": True,
                 "response": combined_text,
                 "analysis_type": "ocr",
@@ -239,82 +770,438 @@ class ImageAgent(BaseAgent):
                 }
             }
             
+            if cache_key and not any(r.get("error") for r in results.values()):
+                self._ocr_cache.set(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error in OCR: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def _ocr_tesseract(self, image_path: str) -> Dict[str, Any]:
-        """Run Tesseract OCR"""
+    def _ocr_tesseract(
+        self,
+        image: ImageInput,
+        max_edge: int = OCR_MAX_EDGE,
+        image_kind: Optional[str] = None,
+        preprocessed: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run Tesseract OCR on an image file path, encoded bytes or grayscale pixels
+        
+        Args:
+            image: Image file path, encoded bytes or grayscale ndarray
+            max_edge: Long-edge cap for preprocessing
+            image_kind: "screenshot", "photo" or "scan" hint for preprocessing
+            preprocessed: image is already a _preprocess_image result
+        """
         try:
-            # Preprocess image
-            processed = self._preprocess_image(image_path)
+            # Preprocess image (pytesseract takes the ndarray directly)
+            processed = image if preprocessed else self._preprocess_image(image, max_edge, image_kind)
             
-            # Run Tesseract
-            text = pytesseract.image_to_string(processed)
+            height, width = processed.shape[:2]
             
-            # Get confidence
-            data = pytesseract.image_to_data(processed, output_type=pytesseract.Output.DICT)
-            confidences = [int(conf) for conf in data['conf'] if conf != '-1']
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            if height * width > TESSERACT_TILE_MAX_PIXELS:
+                result = self._ocr_tesseract_tiled(processed)
+            elif TESSEROCR_AVAILABLE:
+                result = self._ocr_tesserocr(processed)
+            else:
+                # Single Tesseract pass gives both text and confidences
+                data = pytesseract.image_to_data(
+                    processed, lang=self.tesseract_lang, output_type=pytesseract.Output.DICT
+                )
+                result = self._tesseract_result(data)
             
-            logger.info(f"Tesseract OCR complete (confidence: {avg_confidence:.2f}%)")
+            logger.info(f"Tesseract OCR complete (confidence: {result['confidence']:.2f}%)")
             
-            return {
-                "text": text.strip(),
-                "confidence": avg_confidence,
-                "engine": "tesseract"
-            }
+            return result
             
         except Exception as e:
             logger.error(f"Tesseract OCR failed: {e}")
             return {"text": "", "confidence": 0, "error": str(e)}
     
-    def _ocr_gpt_vision(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Run GPT-5 Vision OCR"""
+    def _process_ocr_regions(self, image_data: Dict[str, Any], regions: List[tuple]) -> Dict[str, Any]:
+        """OCR several regions of one image with Tesseract"""
         try:
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": """DOCUMENT OCR EXTRACTION
-
-                        TASK: Extract ALL text from this document image with business-document precision.
-
-                        REQUIREMENTS:
-                        1. Extract every word, number, and symbol
-                        2. Preserve formatting (line breaks, spacing, structure)
-                        3. Identify document structure (headers, sections, tables)
-                        4. Flag uncertain text with [?]
-                        5. Note any missing or illegible sections
-
-                        OUTPUT FORMAT:
-                        **Document Type:** [type]
-
-                        **Full Text:**
-                        [Complete extracted text with formatting preserved]
-
-                        **Structured Data:**
-                        - Date(s): [if present]
-                        - ID/Reference Numbers: [if present]
-                        - Amounts/Prices: [if present]
-                        - Parties/Names: [if present]
-
-                        **Tables** (if present):
-                        [Table data in structured format]
-
-                        **OCR Quality:** [confidence level]
-                        **Issues:** [any unclear sections]
-
-                        Be thorough - every word matters for document intelligence."""
-                        },
-                        self._build_image_content(image_data)
-                    ]
+            image_source = image_data.get("path") or image_data.get("bytes")
+            if not TESSERACT_AVAILABLE or not image_source:
+                return {"success": False, "error": "Region OCR requires Tesseract and a local image"}
+            
+            region_results = self._ocr_tesseract_regions(image_source, regions)
+            
+            return {
+                "success": True,
+                "response": "\n\n".join(r["text"] for r in region_results),
+                "analysis_type": "ocr",
+                "metadata": {
+                    "engines_used": ["tesseract"],
+                    "regions": region_results,
+                    "primary_engine": "tesseract"
                 }
-            ]
+            }
             
-            text = self._call_vision_api(messages)
+        except Exception as e:
+            logger.error(f"Error in region OCR: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def _ocr_tesseract_regions(self, image: ImageInput, boxes: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        OCR multiple regions of an image in a single Tesseract call
+        
+        Crops are stacked into one tall image separated by white rows, and
+        words are mapped back to their region by vertical offset.
+        
+        Args:
+            image: Image file path or encoded bytes
+            boxes: (x, y, w, h) regions in original image coordinates
+            
+        Returns:
+            List of {"text", "confidence"} per region, in box order
+        """
+        gray = self._read_grayscale(image)
+        crops = [gray[y:y + h, x:x + w] for x, y, w, h in boxes]
+        
+        stacked, offsets = self._stack_images(crops)
+        stacked = self._clahe().apply(stacked)
+        _, stacked = cv2.threshold(stacked, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        
+        # PSM 6: treat the stack as a single uniform block of text
+        data = pytesseract.image_to_data(
+            stacked, config="--psm 6", lang=self.tesseract_lang, output_type=pytesseract.Output.DICT
+        )
+        
+        results = [
+            {"text": result["text"], "confidence": result["confidence"]}
+            for result in self._split_stacked_data(data, offsets)
+        ]
+        
+        logger.info(f"Tesseract region OCR complete ({len(boxes)} regions)")
+        return results
+    
+    def _stack_images(self, images: List[np.ndarray]) -> tuple:
+        """
+        Stack grayscale images vertically, padded to a common width with white
+        separators between them
+        
+        Returns:
+            (stacked image, top offset of each image)
+        """
+        width = max(image.shape[1] for image in images)
+        
+        parts = []
+        offsets = []
+        top = 0
+        for image in images:
+            offsets.append(top)
+            parts.append(cv2.copyMakeBorder(
+                image, 0, REGION_SEPARATOR, 0, width - image.shape[1],
+                cv2.BORDER_CONSTANT, value=255
+            ))
+            top += image.shape[0] + REGION_SEPARATOR
+        
+        return np.vstack(parts), offsets
+    
+    def _split_stacked_data(self, data: Dict[str, List], offsets: List[int]) -> List[Dict[str, Any]]:
+        """Split image_to_data output of a stacked image into one Tesseract result per part"""
+        part_rows = [[] for _ in offsets]
+        for row, word_top in enumerate(data['top']):
+            part = max(np.searchsorted(offsets, word_top, side="right") - 1, 0)
+            part_rows[part].append(row)
+        
+        return [
+            self._tesseract_result({key: [values[row] for row in rows] for key, values in data.items()})
+            for rows in part_rows
+        ]
+    
+    def _ocr_tesseract_composite(self, images: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """OCR several small preprocessed images as one stacked image (one Tesseract pass)"""
+        stacked, offsets = self._stack_images(images)
+        data = pytesseract.image_to_data(
+            stacked, lang=self.tesseract_lang, output_type=pytesseract.Output.DICT
+        )
+        return self._split_stacked_data(data, offsets)
+    
+    @contextmanager
+    def _ocr_tesseract_api(self):
+        """
+        Borrow a tesserocr API from the pool
+        
+        A new API (and model load) is only created while fewer than
+        _tess_max_apis exist; otherwise this waits for one to be returned.
+        """
+        try:
+            api = self._tess_pool.get_nowait()
+        except queue.Empty:
+            with self._tess_lock:
+                create = len(self._tess_apis) < self._tess_max_apis
+                if create:
+                    # Reserve the slot so concurrent callers don't overshoot while the model loads
+                    self._tess_apis.append(None)
+            api = self._new_tesseract_api() if create else self._tess_pool.get()
+        
+        try:
+            yield api
+        finally:
+            self._tess_pool.put(api)
+    
+    def _new_tesseract_api(self) -> "PyTessBaseAPI":
+        """Load a tesserocr API into a slot reserved by _ocr_tesseract_api"""
+        try:
+            tessdata_path = settings.get('image.tessdata_path')
+            if tessdata_path:
+                api = PyTessBaseAPI(
+                    path=tessdata_path, lang=self.tesseract_lang, psm=PSM.AUTO, oem=OEM.LSTM_ONLY
+                )
+            else:
+                api = PyTessBaseAPI(lang=self.tesseract_lang, psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+        except Exception:
+            with self._tess_lock:
+                self._tess_apis.remove(None)
+            raise
+        
+        with self._tess_lock:
+            self._tess_apis[self._tess_apis.index(None)] = api
+        logger.info(f"tesserocr API initialized ({len(self._tess_apis)}/{self._tess_max_apis})")
+        return api
+    
+    def close(self):
+        """Release the idle tesserocr APIs (new ones are loaded if OCR runs again)"""
+        closed = 0
+        while True:
+            try:
+                api = self._tess_pool.get_nowait()
+            except queue.Empty:
+                break
+            with self._tess_lock:
+                self._tess_apis.remove(api)
+            api.End()
+            closed += 1
+        
+        if closed:
+            logger.info(f"Closed {closed} tesserocr API(s)")
+    
+    def _ocr_tesserocr(self, processed: np.ndarray) -> Dict[str, Any]:
+        """Run Tesseract in-process through tesserocr"""
+        with self._ocr_tesseract_api() as api:
+            api.SetImage(Image.fromarray(processed))
+            
+            text = api.GetUTF8Text()
+            avg_confidence = self._mean_confidence(api.AllWordConfidences())
+        
+        return {
+            "text": text.strip(),
+            "confidence": avg_confidence,
+            "engine": "tesseract"
+        }
+    
+    def _ocr_tesseract_tiled(self, processed: np.ndarray) -> Dict[str, Any]:
+        """OCR a large image as overlapping tiles in parallel and stitch words back in reading order"""
+        height, width = processed.shape[:2]
+        tile_width, tile_height = TESSERACT_TILE_SIZE
+        
+        origins = [
+            (x, y)
+            for y in self._tile_origins(height, tile_height)
+            for x in self._tile_origins(width, tile_width)
+        ]
+        
+        def ocr_tile(origin):
+            x, y = origin
+            return pytesseract.image_to_data(
+                processed[y:y + tile_height, x:x + tile_width],
+                lang=self.tesseract_lang, output_type=pytesseract.Output.DICT
+            )
+        
+        # Tesseract runs out of process, so tiles overlap in threads
+        with ThreadPoolExecutor(max_workers=TESSERACT_TILE_WORKERS) as executor:
+            tile_data = list(executor.map(ocr_tile, origins))
+        
+        # Collect words in image coordinates, dropping duplicates from overlapping tiles
+        words = []
+        for (x, y), data in zip(origins, tile_data):
+            previous_tiles = len(words)
+            for i, text in enumerate(data['text']):
+                if not text or not text.strip():
+                    continue
+                
+                box = (data['left'][i] + x, data['top'][i] + y, data['width'][i], data['height'][i])
+                if any(self._box_iou(box, word["box"]) > 0.5 for word in words[:previous_tiles]):
+                    continue
+                
+                words.append({"box": box, "text": text, "conf": float(data['conf'][i])})
+        
+        # Group words into lines by vertical position, then order each line left to right
+        lines = []
+        for word in sorted(words, key=lambda w: (w["box"][1], w["box"][0])):
+            left, top, _, word_height = word["box"]
+            if lines and top + word_height / 2 <= lines[-1]["bottom"]:
+                lines[-1]["words"].append(word)
+            else:
+                lines.append({"bottom": top + word_height, "words": [word]})
+        
+        text = "\n".join(
+            " ".join(w["text"] for w in sorted(line["words"], key=lambda w: w["box"][0]))
+            for line in lines
+        )
+        
+        avg_confidence = self._mean_confidence([w["conf"] for w in words])
+        
+        logger.info(f"Tesseract tiled OCR: {len(origins)} tiles, {len(words)} words")
+        
+        return {
+            "text": text.strip(),
+            "confidence": avg_confidence,
+            "engine": "tesseract",
+            "tiles": len(origins)
+        }
+    
+    def _tile_origins(self, length: int, tile: int) -> List[int]:
+        """Tile start offsets along one axis with TESSERACT_TILE_OVERLAP overlap"""
+        step = max(1, int(tile * (1 - TESSERACT_TILE_OVERLAP)))
+        origins = list(range(0, max(length - tile, 0) + 1, step))
+        
+        # Make sure the last tile reaches the edge
+        if origins[-1] + tile < length:
+            origins.append(length - tile)
+        
+        return origins
+    
+    def _box_iou(self, a: tuple, b: tuple) -> float:
+        """Intersection over union of two (left, top, width, height) boxes"""
+        overlap_w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+        overlap_h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+        
+        if overlap_w <= 0 or overlap_h <= 0:
+            return 0.0
+        
+        intersection = overlap_w * overlap_h
+        return intersection / (a[2] * a[3] + b[2] * b[3] - intersection)
+    
+    def _ocr_tesseract_batch(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Run Tesseract OCR on many images with one Tesseract process per chunk
+        
+        Args:
+            image_paths: Image file paths
+            
+        Returns:
+            List of Tesseract results, in input order
+        """
+        results = []
+        
+        for start in range(0, len(image_paths), TESSERACT_BATCH_SIZE):
+            chunk = image_paths[start:start + TESSERACT_BATCH_SIZE]
+            
+            try:
+                processed = [self._preprocess_image(image_path) for image_path in chunk]
+                chunk_results = [None] * len(chunk)
+                
+                # Small images (receipt lines, UI crops) share one composite image
+                small = [i for i, image in enumerate(processed) if image.size <= COMPOSITE_MAX_PIXELS]
+                for group in self._composite_groups([processed[i] for i in small]):
+                    group_results = self._ocr_tesseract_composite([processed[small[j]] for j in group])
+                    for j, result in zip(group, group_results):
+                        chunk_results[small[j]] = result
+                
+                # Larger images go through Tesseract's list-of-images input
+                large = [i for i in range(len(chunk)) if chunk_results[i] is None]
+                if large:
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        processed_paths = []
+                        for i in large:
+                            processed_path = str(Path(tmp_dir) / f"{i}.png")
+                            cv2.imwrite(processed_path, processed[i])
+                            processed_paths.append(processed_path)
+                        
+                        # Tesseract treats a .txt input as a list of images, one per line
+                        list_path = Path(tmp_dir) / "images.txt"
+                        list_path.write_text("\n".join(processed_paths))
+                        
+                        data = pytesseract.image_to_data(
+                            str(list_path), lang=self.tesseract_lang, output_type=pytesseract.Output.DICT
+                        )
+                    
+                    # Split rows back into per-image results (page_num is 1-based per image)
+                    rows_by_page = {}
+                    for row, page in enumerate(data['page_num']):
+                        rows_by_page.setdefault(int(page), []).append(row)
+                    
+                    for page, i in enumerate(large, start=1):
+                        rows = rows_by_page.get(page, [])
+                        page_data = {key: [values[row] for row in rows] for key, values in data.items()}
+                        chunk_results[i] = self._tesseract_result(page_data)
+                
+                results.extend(chunk_results)
+                
+                logger.info(f"Tesseract batch OCR complete ({len(chunk)} images)")
+                
+            except Exception as e:
+                logger.warning(f"Tesseract batch OCR failed: {e}, falling back to per-image OCR")
+                results.extend(self._ocr_tesseract(image_path) for image_path in chunk)
+        
+        return results
+    
+    def _composite_groups(self, images: List[np.ndarray]) -> List[List[int]]:
+        """Group image indices into composites no taller than COMPOSITE_MAX_HEIGHT"""
+        groups = []
+        height = 0
+        for i, image in enumerate(images):
+            image_height = image.shape[0] + REGION_SEPARATOR
+            if not groups or height + image_height > COMPOSITE_MAX_HEIGHT:
+                groups.append([])
+                height = 0
+            groups[-1].append(i)
+            height += image_height
+        return groups
+    
+    def _tesseract_result(self, data: Dict[str, List]) -> Dict[str, Any]:
+        """Build a Tesseract result (text + mean word confidence) from image_to_data output"""
+        text = self._text_from_tesseract_data(data)
+        
+        avg_confidence = self._mean_confidence(data['conf'])
+        
+        return {
+            "text": text.strip(),
+            "confidence": avg_confidence,
+            "engine": "tesseract"
+        }
+    
+    def _mean_confidence(self, confidences: List) -> float:
+        """Mean Tesseract word confidence, ignoring -1 (non-word) entries"""
+        conf = np.asarray(confidences, dtype=np.float32)
+        valid = conf >= 0
+        count = np.count_nonzero(valid)
+        # Masked sum avoids materializing a filtered copy
+        return float(conf.sum(where=valid) / count) if count else 0.0
+    
+    def _text_from_tesseract_data(self, data: Dict[str, List]) -> str:
+        """Rebuild plain text from image_to_data output (lines by line_num, blank line between paragraphs)"""
+        paragraphs = []
+        lines = {}
+        current_par = None
+        
+        for word, block, par, line in zip(data['text'], data['block_num'], data['par_num'], data['line_num']):
+            if not word or not word.strip():
+                continue
+            
+            if (block, par) != current_par:
+                if lines:
+                    paragraphs.append("\n".join(" ".join(words) for words in lines.values()))
+                lines = {}
+                current_par = (block, par)
+            
+            lines.setdefault(line, []).append(word)
+        
+        if lines:
+            paragraphs.append("\n".join(" ".join(words) for words in lines.values()))
+        
+        return "\n\n".join(paragraphs)
+    
+    def _ocr_gpt_vision(self, image_data: Dict[str, Any], processed: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Run GPT-5 Vision OCR (on the preprocessed image if given, else the original)"""
+        try:
+            request = self._build_vision_request("ocr", image_data, "", processed)
+            text = self._call_vision_api(request["messages"])
             
             return {
                 "text": text,
@@ -331,194 +1218,213 @@ class ImageAgent(BaseAgent):
         
         # If only one engine, use it
         if len(results) == 1:
-            engine_name = list(results.keys())[0]
-            return results[engine_name]["text"]
+            return next(iter(results.values()))["text"]
+        
+        tess = results.get("tesseract")
+        gpt = results.get("gpt_vision")
         
         # Both available: prefer Tesseract if confident
-        if "tesseract" in results:
-            tess_conf = results["tesseract"].get("confidence", 0)
-            tess_text = results["tesseract"]["text"]
+        if tess is not None:
+            tess_conf = tess.get("confidence", 0)
+            tess_text = tess["text"]
             
             if tess_conf > 75:
                 # High confidence - use Tesseract
                 logger.info(f"Using Tesseract (confidence: {tess_conf:.1f}%)")
-                if "gpt_vision" in results:
+                if gpt is not None:
                     return f"{tess_text}\n\n[Validated with GPT-5 Vision]"
                 return tess_text
             
             # Medium confidence - show both
             logger.info("Showing both Tesseract and GPT Vision results")
-            combined = [
-                f"[TESSERACT - {tess_conf:.1f}%]",
-                tess_text,
-                ""
-            ]
-            
-            if "gpt_vision" in results:
-                gpt_text = results["gpt_vision"]["text"]
-                gpt_conf = results["gpt_vision"].get("confidence", 95)
-                combined.extend([
-                    f"[GPT VISION - {gpt_conf:.1f}%]",
-                    gpt_text
-                ])
-            
-            return "\n".join(combined)
+            tess_block = f"[TESSERACT - {tess_conf:.1f}%]\n{tess_text}\n"
+            
+            if gpt is None:
+                return tess_block
+            return f"{tess_block}\n[GPT VISION - {gpt.get('confidence', 95):.1f}%]\n{gpt['text']}"
         
         # Only GPT available
         return results["gpt_vision"]["text"]
     
     def _describe_image(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate image description"""
-        try:
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": """Document Image Analysis:
-
-                            TASK: Identify and describe this document image for business intelligence.
-
-                            OUTPUT:
-                            **Document Type:** [invoice/contract/receipt/form/report/letter/diagram/other]
-
-                            **Key Visual Elements:**
-                            - Headers/Titles: [text]
-                            - Logos/Branding: [if present]
-                            - Layout: [single/multi-column, form, table, freeform]
-                            - Notable Features: [stamps, signatures, barcodes]
-
-                            **Text Preview:** [sample of visible text]
-
-                            **Quality Assessment:**
-                            - Scan Quality: [excellent/good/poor]
-                            - Readability: [clear/moderate/difficult]
-                            - Issues: [blur, skew, shadows, missing parts]
-
-                            **Recommended Action:** [OCR/manual entry/rescan]
-
-                            Focus on document characteristics, not artistic description."""
-                        },
-                        self._build_image_content(image_data)
-                    ]
-                }
-            ]
-            
-            response = self._call_vision_api(messages)
-            
-            return {
-                "success": True,
-                "response": response,
-                "analysis_type": "describe",
-                "metadata": {
-                    "image_source": image_data.get("type"),
-                    "model": self.vision_model
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Error describing image: {str(e)}")
-            return {"success": False, "error": str(e)}
+        return self._run_vision("describe", image_data, "")
     
     def _analyze_image(self, image_data: Dict[str, Any], query: str) -> Dict[str, Any]:
         """Perform custom analysis"""
+        return self._run_vision("analyze", image_data, query)
+    
+    def _answer_question(self, image_data: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """Answer question about image"""
+        return self._run_vision("question", image_data, query)
+    
+    def _run_vision(self, analysis_type: str, image_data: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """Run a describe/analyze/question request through GPT Vision"""
         try:
-            analysis_prompt = query if query else """Deep Document Analysis:
-
-            ANALYZE this document image for:
-            1. Document Type & Purpose
-            2. Key Information (dates, amounts, parties, terms)
-            3. Document Structure (sections, clauses, fields)
-            4. Legal/Financial Elements (signatures, totals, terms)
-            5. Completeness (missing fields, stamps, signatures)
-            6. Risks/Flags (anomalies, inconsistencies, concerns)
-
-            Provide business intelligence, not just description."""
-            
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": analysis_prompt},
-                        self._build_image_content(image_data)
-                    ]
-                }
-            ]
-            
-            response = self._call_vision_api(messages)
-            
-            return {
-                "success": True,
-                "response": response,
-                "analysis_type": "analyze",
-                "metadata": {
-                    "query": analysis_prompt,
-                    "model": self.vision_model
-                }
-            }
+            request = self._build_vision_request(analysis_type, image_data, query)
+            response = self._call_vision_api(request["messages"])
+            return self._vision_result(analysis_type, request, response)
             
         except Exception as e:
-            logger.error(f"Error analyzing image: {str(e)}")
+            logger.error(f"Error in image {analysis_type}: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def _answer_question(self, image_data: Dict[str, Any], query: str) -> Dict[str, Any]:
-        """Answer question about image"""
+    async def _arun_vision(self, analysis_type: str, image_data: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """Async version of _run_vision"""
         try:
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": query},
-                        self._build_image_content(image_data)
-                    ]
-                }
-            ]
-            
-            response = self._call_vision_api(messages)
-            
-            return {
-                "success": True,
-                "response": response,
-                "analysis_type": "question",
-                "metadata": {
-                    "query": query,
-                    "model": self.vision_model
-                }
-            }
+            request = self._build_vision_request(analysis_type, image_data, query)
+            response = await self._acall_vision_api(request["messages"])
+            return self._vision_result(analysis_type, request, response)
             
         except Exception as e:
-            logger.error(f"Error answering question: {str(e)}")
+            logger.error(f"Error in image {analysis_type}: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _build_vision_request(
+        self,
+        analysis_type: str,
+        image_data: Dict[str, Any],
+        query: str,
+        processed: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """Build messages and result metadata for a GPT Vision request (ocr/describe/analyze/question)"""
+        image_content = None
+        
+        if analysis_type == "ocr":
+            text_block = _TEXT_BLOCKS["ocr"]
+            image_content = self._build_ocr_image_content(image_data, processed)
+            metadata = {}
+        elif analysis_type == "describe":
+            text_block = _TEXT_BLOCKS["describe"]
+            metadata = {"image_source": image_data.get("type")}
+        else:
+            # Custom analysis falls back to the default prompt; questions use the query as-is
+            prompt = query if query or analysis_type == "question" else ANALYZE_PROMPT
+            text_block = {"type": "text", "text": prompt}
+            metadata = {"query": prompt}
+        
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    text_block,
+                    image_content or self._build_image_content(image_data)
+                ]
+            }
+        ]
+        
+        return {"messages": messages, "metadata": metadata}
+    
+    def _vision_result(self, analysis_type: str, request: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Build the agent result for a GPT Vision request"""
+        return {
+            "success": True,
+            "response": response,
+            "analysis_type": analysis_type,
+            "metadata": {
+                **request["metadata"],
+                "model": self.vision_model
+            }
+        }
+    
     def _build_image_content(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Build image content for API"""
-        if image_data["type"] == "url":
-            return {
+        """Build image content for API (built once per image and reused across calls)"""
+        if "image_content" not in image_data:
+            if image_data["type"] == "url":
+                url = image_data["url"]
+            else:
+                url = self._image_data_url(image_data)
+            
+            image_data["image_content"] = {
                 "type": "image_url",
-                "image_url": {"url": image_data["url"]}
+                "image_url": {"url": url}
             }
-        else:
-            return {
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{image_data['base64']}"
-                }
+        
+        return image_data["image_content"]
+    
+    def _build_ocr_image_content(
+        self,
+        image_data: Dict[str, Any],
+        processed: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """Image content for GPT Vision OCR, preferring the full-resolution preprocessed image"""
+        if processed is None:
+            return self._build_image_content(image_data)
+        
+        # Binarized PNGs are small and read cleanly
+        ok, encoded = cv2.imencode(".png", processed, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+        if not ok:
+            return self._build_image_content(image_data)
+        
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/png;base64,{self._b64encode(memoryview(encoded))}"
             }
+        }
+    
+    def _image_data_url(self, image_data: Dict[str, Any]) -> str:
+        """Encode the image as a data URL (only the finished URL is kept, not a separate base64 copy)"""
+        if "bytes" in image_data:
+            # memoryview avoids copying bytearray/memoryview inputs
+            image_bytes = memoryview(image_data["bytes"])
+            encoded = self._b64encode(self._shrink_for_vision(image_bytes))
+        else:
+            # Map the file instead of reading it into a bytes copy; pages load on demand
+            with open(image_data["path"], "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    encoded = self._b64encode(self._shrink_for_vision(mapped))
+        
+        return f"data:image/jpeg;base64,{encoded}"
+    
+    def _b64encode(self, data) -> str:
+        """Base64-encode bytes-like data to str"""
+        if PYBASE64_AVAILABLE:
+            return pybase64.b64encode_as_string(data)
+        return base64.b64encode(data).decode('ascii')
+    
+    def _shrink_for_vision(self, image_bytes) -> bytes:
+        """Re-encode as JPEG within the vision model's input size (it downsamples larger images anyway)"""
+        try:
+            # mmap objects are file-like already
+            img = Image.open(image_bytes if isinstance(image_bytes, mmap.mmap) else io.BytesIO(image_bytes))
+            
+            if img.format == "JPEG" and max(img.size) <= VISION_MAX_EDGE:
+                return image_bytes
+            
+            img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.LANCZOS)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY, optimize=True)
+            return buffer.getvalue()
+            
+        except Exception as e:
+            logger.warning(f"Could not re-encode image for vision: {e}, sending original")
+            return image_bytes
     
     def _call_vision_api(self, messages: list) -> str:
         """Call OpenAI Vision API"""
         try:
-            params = {
-                "model": self.vision_model,
-                "messages": messages,
-                "store": False,
-                "max_completion_tokens": 1000,
-                "verbosity": "medium",
-                "reasoning_effort": "medium"
-            }
+            response = openai_retry(self.client.chat.completions.create)(
+                messages=messages, **self._vision_params
+            )
             
-            response = self.client.chat.completions.create(**params)
+            result = response.choices[0].message.content
+            logger.info("GPT-5 mini Vision API call successful")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error calling vision API: {str(e)}")
+            raise
+    
+    async def _acall_vision_api(self, messages: list) -> str:
+        """Async version of _call_vision_api"""
+        try:
+            response = await aopenai_retry(self.aclient.chat.completions.create)(
+                messages=messages, **self._vision_params
+            )
             
             result = response.choices[0].message.content
             logger.info("GPT-5 mini Vision API call successful")
@@ -529,5 +1435,17 @@ class ImageAgent(BaseAgent):
             raise
 
 
-# Global instance
-image_agent = ImageAgent()
+# Global instance (constructed on first access, see PEP 562)
+_image_agent = None
+_image_agent_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    if name == "image_agent":
+        global _image_agent
+        if _image_agent is None:
+            with _image_agent_lock:
+                if _image_agent is None:
+                    _image_agent = ImageAgent()
+        return _image_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
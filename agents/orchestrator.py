@@ -3,23 +3,113 @@ LangGraph-based Multi-Agent Orchestrator
 Routes queries to appropriate agents and manages workflows
 """
 
-from typing import Dict, Any, List
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
 from agents.agent_state import AgentState
-from agents.text_agent import text_agent
-from agents.image_agent import image_agent
+from utils.llm_cache import LLMCache
 from utils.logger import logger
-from openai import OpenAI
+from utils.http_client import async_openai_client
+from utils.retry import aopenai_retry
 from config.settings import settings
+import asyncio
 import json
+import threading
+
+
+# Synthesis inputs shorter than this (with fewer than 3 parts) use low reasoning effort
+SIMPLE_SYNTHESIS_CHARS = 2000
+
+SYNTHESIS_SYSTEM_PROMPT = """Combine the analysis results below into a coherent response to the user's question.
+
+Provide a unified, clear answer that integrates all information."""
+
+CLASSIFY_SYSTEM_PROMPT = """You are a Document Processing Request Classifier for AURA.
+
+AGENT CAPABILITIES:
+- text: Document Q&A, contract analysis, RAG search, policy review
+- image: Document OCR, form extraction, invoice processing, diagram analysis
+- audio: Meeting transcription, call analysis, interview intelligence
+- multi_modal: Combined analysis (e.g., "transcribe this meeting and search our contracts")
+
+INTENT TYPES:
+- extract: Pull specific data (dates, amounts, clauses, entities)
+- analyze: Deep document analysis, comparison, risk assessment
+- search: Find information across document knowledge base
+- question: Answer specific question from documents
+- summarize: Condense document or meeting content
+- process: Convert format (OCR, transcribe, translate)"""
+
+CLASSIFY_INPUT_TEMPLATE = """Query: "{query}"
+Has image: {has_image}
+Has audio: {has_audio}"""
+
+# Queries per batched classification call (larger batches degrade per-item accuracy)
+CLASSIFY_BATCH_SIZE = 8
+
+# Structured output for classification: parsed with json.loads, no prose to strip
+CLASSIFY_SCHEMA = {
+    "name": "classification",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "enum": ["text", "image", "audio", "multi_modal"]},
+            "intent": {
+                "type": "string",
+                "enum": ["extract", "analyze", "search", "question", "summarize", "process"]
+            }
+        },
+        "required": ["type", "intent"],
+        "additionalProperties": False
+    },
+    "strict": True
+}
+
+CLASSIFY_BATCH_SCHEMA = {
+    "name": "classifications",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "classifications": {"type": "array", "items": CLASSIFY_SCHEMA["schema"]}
+        },
+        "required": ["classifications"],
+        "additionalProperties": False
+    },
+    "strict": True
+}
+
+
+# Classified query type -> workflow route
+ROUTING_MAP = {
+    "text": "text",
+    "image": "image",
+    "audio": "text",  # Will add audio agent later
+    "multi_modal": "multi_modal"
+}
+
+# Multi-modal "process" (OCR) queries shorter than this skip the text agent
+OCR_ONLY_QUERY_CHARS = 20
+
+# Query intent -> image agent analysis type
+ANALYSIS_TYPE_MAP = {
+    "search": "describe",
+    "analyze": "analyze",
+    "process": "ocr",
+    "question": "question"
+}
 
 
 class AgentOrchestrator:
     """Orchestrates multiple agents using LangGraph"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        # process() always runs on the same background loop, so it keeps one pooled
+        # OpenAI client (httpx connections are bound to the loop that opened them)
+        self._loop = None
+        self._loop_lock = threading.Lock()
         self.model = settings.get('llm.model_name', 'gpt-5-mini')
+        # Identical classification/synthesis requests reuse the earlier response
+        self._response_cache = LLMCache("orchestrator_responses")
         self.workflow = self._build_workflow()
         logger.info("AgentOrchestrator initialized with LangGraph")
     
@@ -61,137 +151,253 @@ class AgentOrchestrator:
         
         return workflow.compile()
     
-    def _call_openai(
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop (on a daemon thread) that runs blocking process() calls"""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="orchestrator-loop", daemon=True).start()
+                    self._loop = loop
+        return self._loop
+    
+    async def _acall_openai(
         self,
         messages: List[Dict[str, str]],
         max_tokens: int = 2000,
         reasoning_effort: str = "medium",
-        verbosity: str = "medium"
+        verbosity: str = "medium",
+        response_format: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Call OpenAI API"""
+        """Call OpenAI API (identical requests are served from the response cache)"""
+        cache_key = LLMCache.make_key(
+            self.model, messages,
+            max_tokens=max_tokens, reasoning_effort=reasoning_effort, verbosity=verbosity,
+            response_format=response_format
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Orchestrator response cache hit")
+            return cached
+        
         try:
-            params = {
-                "model": self.model,
-                "messages": messages,
-                "store": False
-            }
+            params = self._build_params(messages, max_tokens, reasoning_effort, verbosity, response_format)
             
-            # GPT-5 uses max_completion_tokens
-            if "gpt-5" in self.model.lower():
-                params["max_completion_tokens"] = max_tokens
-                params["verbosity"] = verbosity
-                params["reasoning_effort"] = reasoning_effort
-            else:
-                params["max_tokens"] = max_tokens
+            response = await aopenai_retry(async_openai_client().chat.completions.create)(**params)
+            content = response.choices[0].message.content
             
-            response = self.client.chat.completions.create(**params)
-            return response.choices[0].message.content
+            if content:
+                self._response_cache.set(cache_key, content)
+            return content
             
         except Exception as e:
             logger.error(f"OpenAI call failed: {str(e)}")
             raise
     
-    def _parse_classification(self, response: str) -> Dict[str, str]:
-        """Parse classification response"""
+    async def _astream_openai(
+        self,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], Any],
+        max_tokens: int = 2000,
+        reasoning_effort: str = "medium",
+        verbosity: str = "medium"
+    ) -> str:
+        """
+        Streaming version of _acall_openai
+        
+        Each text delta is passed to on_delta as it arrives (a cache hit is
+        passed as one delta). Returns the complete response.
+        """
+        cache_key = LLMCache.make_key(
+            self.model, messages,
+            max_tokens=max_tokens, reasoning_effort=reasoning_effort, verbosity=verbosity,
+            response_format=None
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Orchestrator response cache hit")
+            on_delta(cached)
+            return cached
+        
         try:
-            # Try to extract JSON from response
-            response = response.strip()
+            params = self._build_params(messages, max_tokens, reasoning_effort, verbosity, None)
             
-            # Remove markdown code blocks if present
-            if response.startswith("```"):
-                response = response.split("```")[1]
-                if response.startswith("json"):
-                    response = response[4:]
+            stream = await aopenai_retry(async_openai_client().chat.completions.create)(**params, stream=True)
             
-            # Parse JSON
-            classification = json.loads(response)
+            deltas = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    deltas.append(delta)
+                    on_delta(delta)
             
-            # Validate fields
-            if "type" not in classification or "intent" not in classification:
-                raise ValueError("Missing required fields in classification")
+            content = "".join(deltas)
+            if content:
+                self._response_cache.set(cache_key, content)
+            return content
             
-            return classification
+        except Exception as e:
+            logger.error(f"OpenAI streaming call failed: {str(e)}")
+            raise
+    
+    def _build_params(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        reasoning_effort: str,
+        verbosity: str,
+        response_format: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters for the configured model"""
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "store": False
+        }
+        
+        # GPT-5 uses max_completion_tokens
+        if "gpt-5" in self.model.lower():
+            params["max_completion_tokens"] = max_tokens
+            params["verbosity"] = verbosity
+            params["reasoning_effort"] = reasoning_effort
+        else:
+            params["max_tokens"] = max_tokens
+        
+        if response_format:
+            params["response_format"] = response_format
+        
+        return params
+    
+    def _parse_classification(self, response: str) -> Dict[str, str]:
+        """Parse classification response (JSON constrained by CLASSIFY_SCHEMA)"""
+        try:
+            classification = json.loads(response)
+            return {"type": classification["type"], "intent": classification["intent"]}
             
         except Exception as e:
             logger.error(f"Failed to parse classification: {str(e)}")
             # Return default
             return {"type": "text", "intent": "question"}
     
-    def _classify_query(self, state: AgentState) -> AgentState:
-        """Classify the query type and intent"""
+    async def _classify_query(self, state: AgentState) -> Dict[str, Any]:
+        """Classify the query type and intent (returns only the updated state keys)"""
         try:
             query = state["query"]
             has_image = "image_path" in state and state["image_path"] is not None
             has_audio = "audio_path" in state and state["audio_path"] is not None
+            has_document = state.get("document_path") is not None
+            
+            # Already classified (e.g. by a batched classification in aprocess_many)
+            if state.get("query_type"):
+                intent = state.get("intent") or "question"
+                return {
+                    "intent": intent,
+                    "processing_steps": [f"Classified as {state['query_type']} with intent {intent}"]
+                }
+            
+            # Without attachments the route is always the text agent (which ignores
+            # intent), so skip the classification round trip
+            if not (has_image or has_audio or has_document):
+                logger.info("Classification: Type=text (no attachments, LLM skipped)")
+                return {
+                    "query_type": "text",
+                    "intent": "question",
+                    "processing_steps": ["Classified as text (no attachments)"]
+                }
             
             logger.info(f"Classifying query: {query[:50]}...")
             
             # Simplified classification prompt
             messages = [
-                {
-                    "role": "system",
-                    "content": """You are a Document Processing Request Classifier for AURA.
-
-                    AGENT CAPABILITIES:
-                    - text: Document Q&A, contract analysis, RAG search, policy review
-                    - image: Document OCR, form extraction, invoice processing, diagram analysis
-                    - audio: Meeting transcription, call analysis, interview intelligence
-                    - multi_modal: Combined analysis (e.g., "transcribe this meeting and search our contracts")
-
-                    INTENT TYPES:
-                    - extract: Pull specific data (dates, amounts, clauses, entities)
-                    - analyze: Deep document analysis, comparison, risk assessment
-                    - search: Find information across document knowledge base
-                    - question: Answer specific question from documents
-                    - summarize: Condense document or meeting content
-                    - process: Convert format (OCR, transcribe, translate)
-
-                    Return ONLY valid JSON, no explanation."""
-
-                },
+                {"role": "system", "content": CLASSIFY_SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": f"""Classify this query:
-Query: "{query}"
-Has image: {has_image}
-Has audio: {has_audio}
-
-Return JSON:
-{{
-  "type": "text|image|audio|multi_modal",
-  "intent": "search|question|analyze|process"
-}}"""
+{self._classification_input(query, has_image, has_audio)}"""
                 }
             ]
         
             # Use lower token limit for classification
-            response = self._call_openai(
+            response = await self._acall_openai(
                 messages=messages,
                 max_tokens=100,
                 reasoning_effort="low",
-                verbosity="low"
+                verbosity="low",
+                response_format={"type": "json_schema", "json_schema": CLASSIFY_SCHEMA}
             )
             
             # Parse classification
             classification = self._parse_classification(response)
             
-            state["query_type"] = classification["type"]
-            state["intent"] = classification["intent"]
-            state["processing_steps"].append(
-                f"Classified as {classification['type']} with intent {classification['intent']}"
-            )
-            
             logger.info(f"Classification: Type={classification['type']}, Intent={classification['intent']}")
             
-            return state
+            return {
+                "query_type": classification["type"],
+                "intent": classification["intent"],
+                "processing_steps": [
+                    f"Classified as {classification['type']} with intent {classification['intent']}"
+                ]
+            }
             
         except Exception as e:
             logger.error(f"Classification failed: {str(e)}")
             # Fallback classification
-            state["query_type"] = "text"
-            state["intent"] = "question"
-            state["processing_steps"].append("Classification failed, defaulting to text/question")
-            return state
+            return {
+                "query_type": "text",
+                "intent": "question",
+                "processing_steps": ["Classification failed, defaulting to text/question"]
+            }
+    
+    def _classification_input(self, query: str, has_image: bool, has_audio: bool) -> str:
+        """Query description sent to the classifier"""
+        return CLASSIFY_INPUT_TEMPLATE.format(query=query, has_image=has_image, has_audio=has_audio)
+    
+    async def _classify_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Classify several queries with one API call per CLASSIFY_BATCH_SIZE queries
+        
+        Args:
+            requests: Dicts with "query" and optional "image_path"/"audio_path"
+            
+        Returns:
+            {"type", "intent"} per request, in order (text/question if a batch fails)
+        """
+        classifications = []
+        
+        for start in range(0, len(requests), CLASSIFY_BATCH_SIZE):
+            chunk = requests[start:start + CLASSIFY_BATCH_SIZE]
+            numbered = "\n\n".join(
+                f"{i}. " + self._classification_input(
+                    request["query"], request.get("image_path") is not None, request.get("audio_path") is not None
+                )
+                for i, request in enumerate(chunk, 1)
+            )
+            
+            try:
+                response = await self._acall_openai(
+                    messages=[
+                        {"role": "system", "content": CLASSIFY_SYSTEM_PROMPT},
+                        {
+                            "role": "user",
+                            "content": f"Classify each of these {len(chunk)} queries, in order:\n\n{numbered}"
+                        }
+                    ],
+                    max_tokens=100 * len(chunk),
+                    reasoning_effort="low",
+                    verbosity="low",
+                    response_format={"type": "json_schema", "json_schema": CLASSIFY_BATCH_SCHEMA}
+                )
+                results = json.loads(response)["classifications"]
+                if len(results) != len(chunk):
+                    raise ValueError(f"Expected {len(chunk)} classifications, got {len(results)}")
+                
+            except Exception as e:
+                logger.error(f"Batch classification failed: {str(e)}")
+                results = [{"type": "text", "intent": "question"}] * len(chunk)
+            
+            classifications.extend(results)
+        
+        return classifications
     
     def _route_query(self, state: AgentState) -> str:
         """Route to appropriate agent based on classification"""
@@ -200,58 +406,52 @@ Return JSON:
         if state.get("error"):
             return "error"
         
-        routing = {
-            "text": "text",
-            "image": "image",
-            "audio": "text",  # Will add audio agent later
-            "multi_modal": "multi_modal"
-        }
-        
-        route = routing.get(query_type, "text")
+        route = ROUTING_MAP.get(query_type, "text")
         logger.info(f"Routing to: {route}")
         return route
     
-    def _call_text_agent(self, state: AgentState) -> AgentState:
-        """Call text agent"""
+    async def _call_text_agent(self, state: AgentState) -> Dict[str, Any]:
+        """Call text agent (returns only the updated state keys)"""
         try:
             logger.info("Calling Text Agent...")
             
-            result = text_agent.process({
+            # Imported here so importing the orchestrator doesn't construct the text agent
+            from agents.text_agent import text_agent
+            
+            result = await text_agent.aprocess({
                 "query": state["query"],
                 "use_rag": True,
-                "top_k": 5
+                "top_k": state.get("top_k"),
+                "retrieved_docs": state.get("prefetched_docs")
             })
             
+            update = {"processing_steps": ["Text agent processed"], "current_agent": "text"}
+            
             if result["success"]:
-                state["text_response"] = result["response"]
-                state["retrieved_docs"] = result.get("sources", [])
-                state["metadata"]["documents_used"] = result["metadata"]["documents_retrieved"]
+                update["text_response"] = result["response"]
+                update["retrieved_docs"] = result.get("sources", [])
+                update["metadata"] = {
+                    **state["metadata"], "documents_used": result["metadata"]["documents_retrieved"]
+                }
             else:
-                state["error"] = result.get("error")
+                update["error"] = result.get("error")
             
-            state["processing_steps"].append("Text agent processed")
-            state["current_agent"] = "text"
-            
-            return state
+            return update
             
         except Exception as e:
             logger.error(f"Error calling text agent: {str(e)}")
-            state["error"] = str(e)
-            return state
+            return {"error": str(e)}
     
-    def _call_image_agent(self, state: AgentState) -> AgentState:
-        """Call image agent"""
+    def _call_image_agent(self, state: AgentState) -> Dict[str, Any]:
+        """Call image agent (returns only the updated state keys)"""
         try:
             logger.info("Calling Image Agent...")
             
             # Determine analysis type from intent
-            analysis_type_map = {
-                "search": "describe",
-                "analyze": "analyze",
-                "process": "ocr",
-                "question": "question"
-            }
-            analysis_type = analysis_type_map.get(state.get("intent"), "describe")
+            analysis_type = ANALYSIS_TYPE_MAP.get(state.get("intent"), "describe")
+            
+            # Imported here so text-only use never constructs the image agent
+            from agents.image_agent import image_agent
             
             result = image_agent.process({
                 "image_path": state.get("image_path"),
@@ -259,49 +459,90 @@ Return JSON:
                 "query": state["query"] if analysis_type == "question" else ""
             })
             
+            update = {"processing_steps": ["Image agent processed"], "current_agent": "image"}
+            
             if result["success"]:
-                state["image_analysis"] = {
+                update["image_analysis"] = {
                     "response": result["response"],
                     "analysis_type": result["analysis_type"],
                     "metadata": result["metadata"]
                 }
             else:
-                state["error"] = result.get("error")
-            
-            state["processing_steps"].append("Image agent processed")
-            state["current_agent"] = "image"
+                update["error"] = result.get("error")
             
-            return state
+            return update
             
         except Exception as e:
             logger.error(f"Error calling image agent: {str(e)}")
-            state["error"] = str(e)
-            return state
+            return {"error": str(e)}
     
-    def _call_multi_modal(self, state: AgentState) -> AgentState:
-        """Handle multi-modal queries (text + image)"""
+    async def _call_multi_modal(self, state: AgentState) -> Dict[str, Any]:
+        """Handle multi-modal queries (text + image; returns only the updated state keys)"""
         try:
             logger.info("Processing multi-modal query...")
             
-            # Call both agents
-            state = self._call_image_agent(state)
-            state = self._call_text_agent(state)
+            # A short OCR request ("extract the text") has no question worth a RAG search
+            if state.get("intent") == "process" and len(state["query"]) < OCR_ONLY_QUERY_CHARS:
+                logger.info("OCR-only request, skipping text agent")
+                update = await asyncio.to_thread(self._call_image_agent, state)
+                update["processing_steps"] = update.get("processing_steps", []) + [
+                    "Text agent skipped (OCR-only request)", "Multi-modal processing completed"
+                ]
+                update["current_agent"] = "multi_modal"
+                return update
+            
+            # The agents are independent and only read state, so run both at once
+            # (the image agent's SDKs are sync, hence a thread)
+            tasks = {
+                asyncio.create_task(asyncio.to_thread(self._call_image_agent, state)): "image",
+                asyncio.create_task(self._call_text_agent(state)): "text"
+            }
+            updates = {}
             
-            state["processing_steps"].append("Multi-modal processing completed")
-            state["current_agent"] = "multi_modal"
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    updates[tasks[task]] = task.result()
+                
+                # If one agent failed, the combined answer is an error anyway: cancel
+                # the other (an image agent thread finishes in the background)
+                failed = [name for name, result in updates.items() if result.get("error")]
+                if failed and pending:
+                    for task in pending:
+                        task.cancel()
+                    logger.warning(f"{failed[0].capitalize()} agent failed, cancelled the other agent")
+                    return {
+                        "error": f"{failed[0].capitalize()} analysis failed: {updates[failed[0]]['error']}",
+                        "processing_steps": [f"{failed[0].capitalize()} agent failed"],
+                        "current_agent": "multi_modal"
+                    }
+            
+            image_update, text_update = updates["image"], updates["text"]
+            
+            update = {**image_update, **text_update}
+            update["error"] = image_update.get("error") or text_update.get("error")
+            update["processing_steps"] = (
+                image_update.get("processing_steps", [])
+                + text_update.get("processing_steps", [])
+                + ["Multi-modal processing completed"]
+            )
+            update["current_agent"] = "multi_modal"
             
-            return state
+            return update
             
         except Exception as e:
             logger.error(f"Error in multi-modal processing: {str(e)}")
-            state["error"] = str(e)
-            return state
+            return {"error": str(e)}
     
-    def _synthesize_response(self, state: AgentState) -> AgentState:
-        """Synthesize final response from all agent outputs"""
+    async def _synthesize_response(self, state: AgentState) -> Dict[str, Any]:
+        """Synthesize final response from all agent outputs (returns only the updated state keys)"""
         try:
             logger.info("Synthesizing final response...")
             
+            # Emits response text to astream() callers (no-op otherwise)
+            writer = get_stream_writer()
+            
             # Collect all responses
             parts = []
             sources = []
@@ -321,77 +562,69 @@ Return JSON:
             
             # Combine responses
             if len(parts) > 1:
-                # Multi-modal: synthesize with GPT
-                synthesis_prompt = f"""Combine these analysis results into a coherent response to the user's question: "{state['query']}"
+                # Multi-modal: synthesize with GPT (static instructions first, as a cacheable prefix)
+                synthesis_prompt = f"""User question: "{state['query']}"
 
-{chr(10).join(parts)}
-
-Provide a unified, clear answer that integrates all information."""
+{chr(10).join(parts)}"""
 
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": synthesis_prompt}],
-                    max_completion_tokens=500,
-                    verbosity="medium",
-                    reasoning_effort="medium",
-                    store=False
-                )
+                # Merging a couple of short results needs little reasoning
+                simple = len(parts) < 3 and len(synthesis_prompt) < SIMPLE_SYNTHESIS_CHARS
                 
-                final_response = response.choices[0].message.content
+                final_response = await self._astream_openai(
+                    messages=[
+                        {"role": "system", "content": SYNTHESIS_SYSTEM_PROMPT},
+                        {"role": "user", "content": synthesis_prompt}
+                    ],
+                    on_delta=writer,
+                    max_tokens=500,
+                    reasoning_effort="low" if simple else "medium"
+                )
             else:
                 # Single agent: use direct response
                 final_response = parts[0] if parts else "No response generated."
-            
-            state["final_response"] = final_response
-            state["sources"] = sources
-            state["processing_steps"].append("Response synthesized")
+                # A failed agent leaves no parts; astream reports its error instead
+                if parts or not state.get("error"):
+                    writer(final_response)
             
             logger.info("Synthesis complete")
             
-            return state
+            return {
+                "final_response": final_response,
+                "sources": sources,
+                "processing_steps": ["Response synthesized"]
+            }
             
         except Exception as e:
             logger.error(f"Error synthesizing response: {str(e)}")
-            state["error"] = str(e)
-            state["final_response"] = f"Error: {str(e)}"
-            return state
+            return {"error": str(e), "final_response": f"Error: {str(e)}"}
     
     def process(self, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Process a query through the agent workflow (blocking)
+        
+        Use aprocess from async code; arguments and return value are the same.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aprocess(query, **kwargs), self._background_loop()
+        ).result()
+    
+    async def aprocess(self, query: str, **kwargs) -> Dict[str, Any]:
         """
         Process a query through the agent workflow
         
         Args:
             query: User query
-            **kwargs: Optional image_path, audio_path, document_path
+            **kwargs: Optional image_path, audio_path, document_path, top_k,
+                query_type and intent (skip classification), prefetched_docs
+                (Pinecone matches for the query, skip the text agent's search)
             
         Returns:
             Final result dictionary
         """
         try:
-            # Initialize state
-            initial_state = AgentState(
-                query=query,
-                image_path=kwargs.get("image_path"),
-                audio_path=kwargs.get("audio_path"),
-                document_path=kwargs.get("document_path"),
-                query_type=None,
-                intent=None,
-                current_agent=None,
-                processing_steps=[],
-                text_response=None,
-                image_analysis=None,
-                audio_transcript=None,
-                retrieved_docs=None,
-                confidence=None,
-                error=None,
-                metadata={},
-                final_response=None,
-                sources=None
-            )
-            
             # Run workflow
             logger.info(f"Starting workflow for query: {query[:50]}...")
-            final_state = self.workflow.invoke(initial_state)
+            final_state = await self.workflow.ainvoke(self._initial_state(query, **kwargs))
             
             # FIX: Convert current_agent string to list for agents_used
             current_agent = final_state.get("current_agent")
@@ -427,6 +660,141 @@ Provide a unified, clear answer that integrates all information."""
                 }
             }
 
+    async def astream(self, query: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Process a query, yielding the final response text as it is generated
+        
+        Arguments are the same as aprocess. Errors are yielded as an "Error: ..." message.
+        """
+        try:
+            logger.info(f"Starting streaming workflow for query: {query[:50]}...")
+            
+            streamed = False
+            final_state = {}
+            async for mode, chunk in self.workflow.astream(
+                self._initial_state(query, **kwargs), stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    streamed = True
+                    yield chunk
+                else:
+                    final_state = chunk
+            
+            # Also after partial text (e.g. one agent of a multi-modal query failed)
+            if final_state.get("error"):
+                yield ("\n\n" if streamed else "") + f"Error: {final_state['error']}"
+            
+        except Exception as e:
+            logger.error(f"Error in orchestrator stream: {str(e)}")
+            yield f"Error: {str(e)}"
+    
+    def _initial_state(self, query: str, **kwargs) -> AgentState:
+        """Initial workflow state for a query (see aprocess for kwargs)"""
+        return AgentState(
+            query=query,
+            image_path=kwargs.get("image_path"),
+            audio_path=kwargs.get("audio_path"),
+            document_path=kwargs.get("document_path"),
+            top_k=kwargs.get("top_k"),
+            prefetched_docs=kwargs.get("prefetched_docs"),
+            query_type=kwargs.get("query_type"),
+            intent=kwargs.get("intent"),
+            current_agent=None,
+            processing_steps=[],
+            text_response=None,
+            image_analysis=None,
+            audio_transcript=None,
+            retrieved_docs=None,
+            confidence=None,
+            error=None,
+            metadata={},
+            final_response=None,
+            sources=None
+        )
+    
+    async def aprocess_many(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process several queries concurrently
+        
+        Queries with attachments are classified together in one API call
+        (per CLASSIFY_BATCH_SIZE) instead of one call each, and the queries
+        the text agent will answer are embedded and searched in one batch.
+        
+        Args:
+            requests: Dicts with "query" and any aprocess keyword arguments
+            
+        Returns:
+            aprocess results, in request order
+        """
+        requests = [dict(request) for request in requests]
+        
+        to_classify = [
+            request for request in requests
+            if not request.get("query_type")
+            and any(request.get(key) is not None for key in ("image_path", "audio_path", "document_path"))
+        ]
+        if len(to_classify) > 1:
+            classifications = await self._classify_batch(to_classify)
+            for request, classification in zip(to_classify, classifications):
+                request["query_type"] = classification["type"]
+                request["intent"] = classification["intent"]
+        
+        # Image-only queries never reach the text agent
+        to_retrieve = [
+            request for request in requests
+            if request.get("query") and request.get("query_type") != "image"
+        ]
+        if len(to_retrieve) > 1:
+            await self._prefetch_docs(to_retrieve)
+        
+        return await asyncio.gather(*(
+            self.aprocess(request.pop("query"), **request) for request in requests
+        ))
+    
+    async def _prefetch_docs(self, requests: List[Dict[str, Any]]):
+        """
+        Retrieve documents for several text queries with one PineconeStore.query_batch per top_k
+        
+        The query embeddings also warm the embedding cache the text agent reads.
+        Each request gets "prefetched_docs"; if embedding fails the requests are
+        left as they are and the text agent searches itself.
+        """
+        from agents.text_agent import text_agent
+        from utils.embedding_wrapper import cached_embeddings
+        from utils.pinecone_store import pinecone_store
+        
+        try:
+            vectors = await asyncio.to_thread(
+                cached_embeddings.embed_documents, [request["query"] for request in requests]
+            )
+        except Exception as e:
+            logger.warning(f"Batch query embedding failed: {e}")
+            return
+        
+        groups: Dict[int, List[int]] = {}
+        for i, request in enumerate(requests):
+            groups.setdefault(request.get("top_k") or text_agent.top_k, []).append(i)
+        
+        for top_k, indices in groups.items():
+            matches = await asyncio.to_thread(
+                pinecone_store.query_batch,
+                [requests[i]["query"] for i in indices], top_k, None, [vectors[i] for i in indices]
+            )
+            for i, docs in zip(indices, matches):
+                requests[i]["prefetched_docs"] = docs
+
+
+# Global instance (constructed on first access, see PEP 562)
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
 
-# Global instance
-orchestrator = AgentOrchestrator()
+def __getattr__(name: str):
+    if name == "orchestrator":
+        global _orchestrator
+        if _orchestrator is None:
+            with _orchestrator_lock:
+                if _orchestrator is None:
+                    _orchestrator = AgentOrchestrator()
+        return _orchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
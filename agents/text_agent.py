@@ -3,24 +3,124 @@ Text Agent for AURA - Enhanced with LangChain
 Handles text-based queries, document Q&A, and retrieval-augmented generation
 """
 
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
+import asyncio
+import json
+import threading
 from agents.base_agent import BaseAgent
 from utils.pinecone_store import pinecone_store
+from utils.llm_cache import LLMCache
 from utils.logger import logger
 
 # LangChain imports
 from langchain_openai import ChatOpenAI
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_pinecone import PineconeVectorStore
-from langchain_core.prompts import PromptTemplate
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
-from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
-from utils.embedding_wrapper import langchain_embeddings  
+from utils.embedding_wrapper import cached_embeddings
+from utils.http_client import get_http_client
 from pinecone import Pinecone
 from config.settings import settings
 
 
+# Static system prompts come first and never contain per-request text, so the
+# provider's prompt cache can reuse their prefix across calls
+RAG_SYSTEM_PROMPT = """You are a Document Intelligence Agent in the AURA system.
+
+SPECIALIZATION: Business document analysis (contracts, invoices, reports, policies, emails)
+
+CORE TASKS:
+1. Document Q&A: Answer questions using ONLY retrieved documents
+2. Data Extraction: Pull specific fields (dates, amounts, parties, IDs)
+3. Document Comparison: Identify similarities/differences across documents
+4. Compliance Checking: Flag risks, missing clauses, anomalies
+5. Entity Recognition: Identify companies, people, locations, terms
+
+OUTPUT STRUCTURE:
+Always provide:
+- Direct answer with document citations
+- Structured data extraction
+- Confidence level with reasoning
+- Warnings/flags if relevant
+
+CITATION FORMAT:
+"According to Document 2, Section 3.4..."
+"Invoice #12345 shows total amount: $X (Document 1)"
+
+NEVER:
+- Make up information not in documents
+- Provide general knowledge responses
+- Ignore contradictions between documents
+- Skip citing sources"""
+
+LANGCHAIN_RAG_SYSTEM_PROMPT = """You are a Document Intelligence Specialist within AURA.
+
+MISSION: Extract, analyze, and answer questions from business documents with precision.
+
+RESPONSE FORMAT:
+**Answer:** [Direct answer based on documents]
+
+**Evidence:**
+- Document X: [specific quote or data]
+- Document Y: [specific quote or data]
+
+**Key Data Extracted:**
+[Any structured data: dates, amounts, parties, terms]
+
+**Confidence:** [High/Medium/Low]
+**Source Quality:** [How relevant were the documents]
+
+RULES:
+✓ Only use information from provided context
+✓ Cite specific documents and sections
+✓ Extract structured data (dates, amounts, names, IDs)
+✓ Flag missing or ambiguous information
+✓ Identify document types when relevant
+✗ No speculation beyond document content
+✗ No generic knowledge - documents only"""
+
+LANGCHAIN_RAG_USER_PROMPT = """Context from Knowledge Base:
+{context}
+
+User Question: {question}
+
+Answer:"""
+
+# User messages for the custom RAG path (with and without retrieved context)
+RAG_USER_TEMPLATE = """Context from relevant documents:
+
+{context}
+
+---
+
+User Question: {query}
+
+Please answer the question based on the context provided above."""
+
+RAG_NO_CONTEXT_TEMPLATE = """No relevant documents were found in the knowledge base.
+
+User Question: {query}
+
+Please provide a general answer based on your knowledge, but clearly state that this is not based on the knowledge base."""
+
+
+# Characters of each retrieved document shown in sources
+SOURCE_PREVIEW_CHARS = 200
+
+# Max tokens for document batch analysis
+DOCUMENT_ANALYSIS_MAX_TOKENS = 4000
+
+# Reasoning effort per analysis type (summaries and extraction don't need deep reasoning)
+REASONING_BY_ANALYSIS_TYPE = {"summary": "low", "extract_key_points": "low", "compare": "medium"}
+
+
+def format_docs(docs: List[Document]) -> str:
+    """Format retrieved LangChain documents as prompt context"""
+    return "\n\n".join(f"Document {i}:\n{doc.page_content}" for i, doc in enumerate(docs, 1))
+
+
 class TextAgent(BaseAgent):
     """Agent specialized in text processing and document Q&A with LangChain"""
     
@@ -30,6 +130,29 @@ class TextAgent(BaseAgent):
             description="document analysis, question answering, and information retrieval"
         )
         self.top_k = 5
+        self.batch_concurrency = settings.get('llm.batch_concurrency', 10)
+        self.batch_reasoning_effort = settings.get('llm.batch_reasoning_effort')
+        
+        # Built once so every RAG call sends a byte-identical system prefix
+        self._rag_system_msg = {"role": "system", "content": RAG_SYSTEM_PROMPT}
+        
+        # Repeat and near-repeat queries reuse the earlier response. Answers embed
+        # retrieved context, and the index changes as documents are added, so both
+        # caches are in memory only and entries expire
+        self._response_cache = LLMCache(
+            "text_responses",
+            persist=False,
+            ttl=settings.get('cache.rag_ttl', 900)
+        )
+        
+        # Retrieved context per query
+        self._retrieval_cache = LLMCache(
+            "rag_retrieval",
+            max_entries=settings.get('cache.retrieval_cache_size', 4096),
+            similarity_threshold=settings.get('cache.retrieval_threshold', 0.97),
+            persist=False,
+            ttl=settings.get('cache.rag_ttl', 900)
+        )
         
         # Initialize LangChain components
         self._init_langchain()
@@ -44,8 +167,18 @@ class TextAgent(BaseAgent):
                 model="gpt-5-mini",
                 max_tokens=2000,
                 openai_api_key=settings.openai_api_key,
+                # Sync calls share the agents' connection pool
+                http_client=get_http_client(),
             )
             
+            if pinecone_store.local_store is not None:
+                # Offline: retrieval goes through pinecone_store's local index (custom RAG path)
+                logger.info("Local vector store in use, LangChain retrieval disabled")
+                self.vectorstore = None
+                self.answer_chain = None
+                self.memory = ChatMessageHistory()
+                return
+            
             # Initialize Pinecone for LangChain
             pc = Pinecone(api_key=settings.pinecone_api_key)
             index = pc.Index(settings.get('pinecone.index_name'))
@@ -53,7 +186,7 @@ class TextAgent(BaseAgent):
             # Create LangChain vector store
             self.vectorstore = PineconeVectorStore(
                 index=index,
-                embedding=langchain_embeddings,
+                embedding=cached_embeddings,
                 text_key="text"
             )
             
@@ -61,60 +194,15 @@ class TextAgent(BaseAgent):
             self.memory = ChatMessageHistory()
             self.memory_key = "chat_history"
             
-            # Create retriever
-            self.retriever = self.vectorstore.as_retriever(search_kwargs={"k": self.top_k})
+            # Static instructions in the system message, context and question in the user message
+            self.prompt_template = ChatPromptTemplate.from_messages([
+                ("system", LANGCHAIN_RAG_SYSTEM_PROMPT),
+                ("human", LANGCHAIN_RAG_USER_PROMPT)
+            ])
             
-            # Create custom prompt
-            self.prompt_template = PromptTemplate(
-                input_variables=["context", "question"],
-               template="""You are a Document Intelligence Specialist within AURA.
-
-MISSION: Extract, analyze, and answer questions from business documents with precision.
-
-Context from Knowledge Base:
-{context}
-
-User Question: {question}
-
-RESPONSE FORMAT:
-**Answer:** [Direct answer based on documents]
-
-**Evidence:**
-- Document X: [specific quote or data]
-- Document Y: [specific quote or data]
-
-**Key Data Extracted:**
-[Any structured data: dates, amounts, parties, terms]
-
-**Confidence:** [High/Medium/Low]
-**Source Quality:** [How relevant were the documents]
-
-RULES:
-✓ Only use information from provided context
-✓ Cite specific documents and sections
-✓ Extract structured data (dates, amounts, names, IDs)
-✓ Flag missing or ambiguous information
-✓ Identify document types when relevant
-✗ No speculation beyond document content
-✗ No generic knowledge - documents only
-
-Answer:"""
-            )
-            
-            # Simple RAG chain using LCEL (LangChain Expression Language)
-            
-            def format_docs(docs):
-                return "\n\n".join([f"Document {i+1}:\n{doc.page_content}" for i, doc in enumerate(docs)])
-            
-            self.rag_chain = (
-                {
-                    "context": self.retriever | format_docs,
-                    "question": RunnablePassthrough()
-                }
-                | self.prompt_template
-                | self.llm
-                | StrOutputParser()
-            )
+            # Answer chain using LCEL (LangChain Expression Language); retrieval happens
+            # once in _process_with_langchain so its documents also provide the sources
+            self.answer_chain = self.prompt_template | self.llm | StrOutputParser()
             
             logger.info("LangChain components initialized successfully")
             
@@ -123,7 +211,7 @@ Answer:"""
             # Fallback to basic mode
             self.llm = None
             self.vectorstore = None
-            self.rag_chain = None
+            self.answer_chain = None
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -135,7 +223,10 @@ Answer:"""
                 "use_rag": bool (default: True),
                 "top_k": int (optional),
                 "use_memory": bool (default: False),
-                "filters": dict (optional)
+                "filters": dict (optional),
+                "query_embedding": list (optional, reused instead of embedding the query),
+                "retrieved_docs": list (optional, PineconeStore.query matches fetched
+                    by the caller with the same top_k/filters; skips retrieval)
             }
             
         Returns:
@@ -147,27 +238,27 @@ Answer:"""
             }
         """
         try:
-            query = input_data.get("query", "")
-            use_rag = input_data.get("use_rag", True)
-            use_memory = input_data.get("use_memory", False)
-            
-            if not query:
-                return {
-                    "success": False,
-                    "error": "No query provided"
-                }
+            request = self._prepare_request(input_data)
+            if "result" in request:
+                return request["result"]
             
-            logger.info(f"Processing text query: {query[:50]}...")
+            query = request["query"]
             
             # Use LangChain RAG if available and enabled
-            if use_rag and self.rag_chain:
-                return self._process_with_langchain(query, use_memory)
-            elif use_rag:
+            if request["use_rag"] and self.answer_chain:
+                result = self._process_with_langchain(
+                    query, request["use_memory"], request["query_embedding"],
+                    request["input_data"].get("top_k"), request["input_data"].get("filters"),
+                    request["input_data"].get("retrieved_docs")
+                )
+            elif request["use_rag"]:
                 # Fallback to custom RAG
-                return self._process_with_custom_rag(query, input_data)
+                result = self._process_with_custom_rag(query, request["input_data"])
             else:
                 # No RAG - direct query
-                return self._process_direct(query)
+                result = self._process_direct(query)
+            
+            return self._finish_request(request, result)
             
         except Exception as e:
             logger.error(f"Error in TextAgent.process: {str(e)}")
@@ -176,8 +267,161 @@ Answer:"""
                 "error": str(e)
             }
     
-    def _process_with_langchain(self, query: str, use_memory: bool) -> Dict[str, Any]:
-        """Process query using LangChain RAG chain"""
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of process
+        
+        The LangChain RAG path retrieves and generates without blocking the
+        event loop; the fallback paths run in a worker thread.
+        Arguments and return value are the same as process.
+        """
+        try:
+            # Embedding the query is CPU-bound (local model)
+            request = await asyncio.to_thread(self._prepare_request, input_data)
+            if "result" in request:
+                return request["result"]
+            
+            return self._finish_request(request, await self._adispatch(request))
+            
+        except Exception as e:
+            logger.error(f"Error in TextAgent.aprocess: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def astream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a query, yielding the answer as it is generated
+        
+        Yields {"sources": [...]} once retrieval is done (so citations can be shown
+        early), then {"token": str} chunks; errors are yielded as {"error": str}.
+        Only the LangChain RAG path streams tokens, the others yield their whole
+        answer as one chunk. Input is the same as process.
+        """
+        try:
+            request = await asyncio.to_thread(self._prepare_request, input_data)
+            result = request.get("result")
+            
+            if result is None and request["use_rag"] and self.answer_chain:
+                query = request["query"]
+                if not request["use_memory"]:
+                    self.memory.clear()
+                
+                source_docs = await self._aretrieve(
+                    query, request["query_embedding"],
+                    request["input_data"].get("top_k"), request["input_data"].get("filters"),
+                    request["input_data"].get("retrieved_docs")
+                )
+                yield {"sources": self._langchain_sources(source_docs)}
+                
+                chunks = []
+                async for chunk in self.answer_chain.astream({"context": format_docs(source_docs), "question": query}):
+                    chunks.append(chunk)
+                    yield {"token": chunk}
+                
+                self._finish_request(
+                    request, self._langchain_result(query, source_docs, "".join(chunks), request["use_memory"])
+                )
+                return
+            
+            if result is None:
+                result = self._finish_request(request, await self._adispatch(request))
+            
+            if not result["success"]:
+                yield {"error": result["error"]}
+                return
+            
+            yield {"sources": result.get("sources", [])}
+            yield {"token": result["response"]}
+            
+        except Exception as e:
+            logger.error(f"Error in TextAgent.astream: {str(e)}")
+            yield {"error": str(e)}
+    
+    async def _adispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a prepared request with the LangChain, custom or direct path"""
+        query = request["query"]
+        
+        if request["use_rag"] and self.answer_chain:
+            return await self._aprocess_with_langchain(
+                query, request["use_memory"], request["query_embedding"],
+                request["input_data"].get("top_k"), request["input_data"].get("filters"),
+                request["input_data"].get("retrieved_docs")
+            )
+        if request["use_rag"]:
+            return await asyncio.to_thread(self._process_with_custom_rag, query, request["input_data"])
+        return await asyncio.to_thread(self._process_direct, query)
+    
+    def _prepare_request(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate input, embed the query and check the response cache
+        
+        Returns:
+            Request fields for processing, or {"result": ...} if the request is
+            already answered (error or cache hit)
+        """
+        query = input_data.get("query", "")
+        use_rag = input_data.get("use_rag", True)
+        use_memory = input_data.get("use_memory", False)
+        
+        if not query:
+            return {"result": {
+                "success": False,
+                "error": "No query provided"
+            }}
+        
+        logger.info(f"Processing text query: {query[:50]}...")
+        
+        # Embed the query once; the semantic cache and Pinecone retrieval share it
+        query_embedding = input_data.get("query_embedding")
+        if query_embedding is None and (not use_memory or use_rag):
+            query_embedding = cached_embeddings.embed_query(query)
+            input_data = {**input_data, "query_embedding": query_embedding}
+        
+        # Conversational (memory) answers depend on history, so they aren't cached
+        cache_key = scope = None
+        if not use_memory:
+            # Semantic matches are only reused between requests with the same options
+            scope = LLMCache.make_key(
+                self.model, None,
+                use_rag=use_rag, top_k=input_data.get("top_k"), filters=input_data.get("filters")
+            )
+            cache_key = LLMCache.make_key(self.model, query, scope=scope)
+            
+            cached = self._response_cache.get(cache_key, query, scope, query_embedding)
+            if cached is not None:
+                logger.info("Text response cache hit")
+                return {"result": {**cached, "metadata": {**cached["metadata"], "cached": True}}}
+        
+        return {
+            "query": query,
+            "use_rag": use_rag,
+            "use_memory": use_memory,
+            "input_data": input_data,
+            "query_embedding": query_embedding,
+            "cache_key": cache_key,
+            "scope": scope
+        }
+    
+    def _finish_request(self, request: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a successful result"""
+        if request["cache_key"] and result["success"]:
+            self._response_cache.set(
+                request["cache_key"], result, request["query"], request["scope"], request["query_embedding"]
+            )
+        return result
+    
+    def _process_with_langchain(
+        self,
+        query: str,
+        use_memory: bool,
+        query_embedding: Optional[List[float]] = None,
+        top_k: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        retrieved_docs: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Process query using LangChain RAG chain (one retrieval feeds both context and sources)"""
         try:
             logger.info("Using LangChain RAG chain")
             
@@ -185,40 +429,141 @@ Answer:"""
             if not use_memory:
                 self.memory.clear()
             
-            # Query the chain
-            response = self.rag_chain.invoke(query)
+            # Retrieve once, reusing the query embedding when we already have it
+            source_docs = self._retrieve(query, query_embedding, top_k, filters, retrieved_docs)
             
-            # Get source documents from retriever
-            source_docs = self.retriever.get_relevant_documents(query)
+            response = self.answer_chain.invoke({"context": format_docs(source_docs), "question": query})
             
-            # Extract sources
-            sources = []
-            for i, doc in enumerate(source_docs):
-                sources.append({
-                    "id": doc.metadata.get("id", f"doc-{i}"),
-                    "score": doc.metadata.get("score", 0.0),
-                    "text": doc.page_content[:200] + "...",
-                    "metadata": doc.metadata
-                })
+            return self._langchain_result(query, source_docs, response, use_memory)
             
-            return {
-                "success": True,
-                "response": response,
-                "sources": sources,
-                "metadata": {
-                    "query": query,
-                    "documents_retrieved": len(sources),
-                    "rag_enabled": True,
-                    "method": "langchain",
-                    "model": self.model,
-                    "memory_used": use_memory
+        except Exception as e:
+            logger.error(f"Error in LangChain processing: {str(e)}")
+            # Fallback to custom RAG
+            return self._process_with_custom_rag(
+                query, {
+                    "top_k": top_k or self.top_k, "filters": filters,
+                    "query_embedding": query_embedding, "retrieved_docs": retrieved_docs
                 }
-            }
+            )
+    
+    async def _aprocess_with_langchain(
+        self,
+        query: str,
+        use_memory: bool,
+        query_embedding: Optional[List[float]] = None,
+        top_k: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        retrieved_docs: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Async version of _process_with_langchain"""
+        try:
+            logger.info("Using LangChain RAG chain (async)")
+            
+            if not use_memory:
+                self.memory.clear()
+            
+            source_docs = await self._aretrieve(query, query_embedding, top_k, filters, retrieved_docs)
+            
+            response = await self.answer_chain.ainvoke({"context": format_docs(source_docs), "question": query})
+            
+            return self._langchain_result(query, source_docs, response, use_memory)
             
         except Exception as e:
             logger.error(f"Error in LangChain processing: {str(e)}")
-            # Fallback to custom RAG
-            return self._process_with_custom_rag(query, {"top_k": self.top_k})
+            return await asyncio.to_thread(
+                self._process_with_custom_rag,
+                query, {
+                    "top_k": top_k or self.top_k, "filters": filters,
+                    "query_embedding": query_embedding, "retrieved_docs": retrieved_docs
+                }
+            )
+    
+    def _retrieve(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]] = None,
+        top_k: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        retrieved_docs: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Document]:
+        """
+        Retrieve documents for query, reusing its embedding if given
+        
+        Metadata filters are applied by Pinecone during the search, so top_k
+        results all match them. Matches already fetched by the caller
+        (retrieved_docs) are used without searching.
+        """
+        if retrieved_docs is not None:
+            return self._match_documents(retrieved_docs)
+        if query_embedding is not None:
+            return self.vectorstore.similarity_search_by_vector(query_embedding, k=top_k or self.top_k, filter=filters)
+        return self.vectorstore.similarity_search(query, k=top_k or self.top_k, filter=filters)
+    
+    async def _aretrieve(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]] = None,
+        top_k: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        retrieved_docs: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Document]:
+        """Async version of _retrieve"""
+        if retrieved_docs is not None:
+            return self._match_documents(retrieved_docs)
+        if query_embedding is not None:
+            return await self.vectorstore.asimilarity_search_by_vector(
+                query_embedding, k=top_k or self.top_k, filter=filters
+            )
+        return await self.vectorstore.asimilarity_search(query, k=top_k or self.top_k, filter=filters)
+    
+    def _match_documents(self, matches: List[Dict[str, Any]]) -> List[Document]:
+        """LangChain documents for PineconeStore.query matches"""
+        return [
+            Document(
+                page_content=match["text"],
+                metadata={
+                    **{key: value for key, value in match["metadata"].items() if key != "text"},
+                    "id": match["id"], "score": match["score"]
+                }
+            )
+            for match in matches
+        ]
+    
+    def _langchain_sources(self, source_docs: List[Document]) -> List[Dict[str, Any]]:
+        """Source entries (id, score, preview, metadata) for retrieved documents"""
+        return [
+            {
+                "id": doc.metadata.get("id", f"doc-{i}"),
+                "score": doc.metadata.get("score", 0.0),
+                "text": self._preview(doc.page_content),
+                "metadata": doc.metadata
+            }
+            for i, doc in enumerate(source_docs)
+        ]
+    
+    def _langchain_result(
+        self,
+        query: str,
+        source_docs: List[Document],
+        response: str,
+        use_memory: bool
+    ) -> Dict[str, Any]:
+        """Build the LangChain RAG result with sources from the retrieved documents"""
+        sources = self._langchain_sources(source_docs)
+        
+        return {
+            "success": True,
+            "response": response,
+            "sources": sources,
+            "metadata": {
+                "query": query,
+                "documents_retrieved": len(sources),
+                "rag_enabled": True,
+                "method": "langchain",
+                "model": self.model,
+                "memory_used": use_memory
+            }
+        }
 
     
     def _process_with_custom_rag(self, query: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -226,32 +571,43 @@ Answer:"""
         try:
             logger.info("Using custom RAG (LangChain fallback)")
             
-            top_k = input_data.get("top_k", self.top_k)
+            top_k = input_data.get("top_k") or self.top_k
             filters = input_data.get("filters")
+            query_embedding = input_data.get("query_embedding")
+            prefetched = input_data.get("retrieved_docs")
+            
+            # Same or near-identical queries reuse the earlier context without a Pinecone round trip
+            scope = LLMCache.make_key("retrieval", None, top_k=top_k, filters=filters)
+            cache_key = LLMCache.make_key("retrieval", query, scope=scope)
+            cached = None if prefetched is not None else self._retrieval_cache.get(
+                cache_key, query, scope, query_embedding
+            )
             
-            # Retrieve documents
-            retrieved_docs = pinecone_store.query(query, top_k=top_k, filter=filters)
-            
-            context = ""
-            sources = []
-            
-            if retrieved_docs:
-                context = self._format_context(retrieved_docs)
-                sources = [
-                    {
-                        "id": doc["id"],
-                        "score": doc["score"],
-                        "text": doc["text"][:200] + "..."
-                    }
-                    for doc in retrieved_docs
-                ]
-                logger.info(f"Retrieved {len(retrieved_docs)} relevant documents")
+            if cached is not None:
+                context, sources = cached["context"], cached["sources"]
+                logger.info(f"Reusing {len(sources)} retrieved documents from cache")
             else:
-                logger.warning("No relevant documents found in knowledge base")
+                # Retrieve documents
+                retrieved_docs = prefetched if prefetched is not None else pinecone_store.query(
+                    query, top_k=top_k, filter=filters, vector=query_embedding
+                )
+                
+                context = ""
+                sources = []
+                
+                if retrieved_docs:
+                    context, sources = self._format_context(retrieved_docs)
+                    logger.info(f"Retrieved {len(retrieved_docs)} relevant documents")
+                    
+                    self._retrieval_cache.set(
+                        cache_key, {"context": context, "sources": sources}, query, scope, query_embedding
+                    )
+                else:
+                    logger.warning("No relevant documents found in knowledge base")
             
             # Build messages
             messages = [
-                {"role": "system", "content": self._build_rag_system_prompt()},
+                self._rag_system_msg,
                 {"role": "user", "content": self._build_user_message(query, context)}
             ]
             
@@ -286,7 +642,7 @@ Answer:"""
             logger.info("Processing without RAG")
             
             messages = [
-                {"role": "system", "content": self._build_system_prompt()},
+                self._system_msg,
                 {"role": "user", "content": query}
             ]
             
@@ -311,65 +667,33 @@ Answer:"""
             logger.error(f"Error in direct processing: {str(e)}")
             raise
     
-    def _format_context(self, documents: List[Dict[str, Any]]) -> str:
-        """Format retrieved documents as context"""
-        context_parts = []
+    def _format_context(self, documents: List[Dict[str, Any]]) -> tuple:
+        """
+        Format retrieved documents as context, building the source list in the same pass
+        
+        Returns:
+            (context string, sources list)
+        """
+        sources = []
         
-        for i, doc in enumerate(documents, 1):
-            context_parts.append(f"[Document {i}] (Relevance: {doc['score']:.2f})")
-            context_parts.append(doc["text"])
-            context_parts.append("")
+        def blocks():
+            for i, doc in enumerate(documents, 1):
+                sources.append({"id": doc["id"], "score": doc["score"], "text": self._preview(doc["text"])})
+                yield f"[Document {i}] (Relevance: {doc['score']:.2f})\n{doc['text']}\n"
         
-        return "\n".join(context_parts)
+        return "\n".join(blocks()), sources
     
-    def _build_rag_system_prompt(self) -> str:
-        """Build system prompt for RAG"""
-        return """You are a Document Intelligence Agent in the AURA system.
-
-    SPECIALIZATION: Business document analysis (contracts, invoices, reports, policies, emails)
-
-    CORE TASKS:
-    1. Document Q&A: Answer questions using ONLY retrieved documents
-    2. Data Extraction: Pull specific fields (dates, amounts, parties, IDs)
-    3. Document Comparison: Identify similarities/differences across documents
-    4. Compliance Checking: Flag risks, missing clauses, anomalies
-    5. Entity Recognition: Identify companies, people, locations, terms
-
-    OUTPUT STRUCTURE:
-    Always provide:
-    - Direct answer with document citations
-    - Structured data extraction
-    - Confidence level with reasoning
-    - Warnings/flags if relevant
-
-    CITATION FORMAT:
-    "According to Document 2, Section 3.4..."
-    "Invoice #12345 shows total amount: $X (Document 1)"
-
-    NEVER:
-    - Make up information not in documents
-    - Provide general knowledge responses
-    - Ignore contradictions between documents
-    - Skip citing sources"""
+    def _preview(self, text: str) -> str:
+        """Source preview: first SOURCE_PREVIEW_CHARS characters, with "..." only if truncated"""
+        if len(text) <= SOURCE_PREVIEW_CHARS:
+            return text
+        return text[:SOURCE_PREVIEW_CHARS] + "..."
     
     def _build_user_message(self, query: str, context: str) -> str:
         """Build user message with query and context"""
         if context:
-            return f"""Context from relevant documents:
-
-{context}
-
----
-
-User Question: {query}
-
-Please answer the question based on the context provided above."""
-        else:
-            return f"""No relevant documents were found in the knowledge base.
-
-User Question: {query}
-
-Please provide a general answer based on your knowledge, but clearly state that this is not based on the knowledge base."""
+            return RAG_USER_TEMPLATE.format(context=context, query=query)
+        return RAG_NO_CONTEXT_TEMPLATE.format(query=query)
     
     def analyze_document_batch(self, documents: List[str], analysis_type: str = "summary") -> Dict[str, Any]:
         """
@@ -403,7 +727,7 @@ Please provide a general answer based on your knowledge, but clearly state that
                 ])
                 
                 messages = [
-                    {"role": "system", "content": self._build_system_prompt()},
+                    self._system_msg,
                     {"role": "user", "content": f"""Analyze the following {len(documents)} documents.
 
 Analysis Type: {analysis_type}
@@ -415,8 +739,8 @@ Provide a {analysis_type} of these documents."""}
                 
                 analysis = self._call_openai(
                     messages=messages,
-                    max_tokens=4000,
-                    reasoning_effort="high"
+                    max_tokens=DOCUMENT_ANALYSIS_MAX_TOKENS,
+                    reasoning_effort=self._analysis_reasoning_effort(analysis_type)
                 )
             
             return {
@@ -435,6 +759,181 @@ Provide a {analysis_type} of these documents."""}
                 "error": str(e)
             }
     
+    async def aanalyze_document_batch(self, documents: List[str], analysis_type: str = "summary") -> Dict[str, Any]:
+        """
+        Analyze documents with one request each, run concurrently
+        
+        Per-document requests stay small as the batch grows, so wall time is
+        roughly one call instead of one huge prompt. "compare" extracts each
+        document's key points this way, then compares them in one final call.
+        
+        Args:
+            documents: List of document texts
+            analysis_type: Type of analysis (summary, extract_key_points, compare)
+            
+        Returns:
+            Analysis results (combined analysis plus one entry per document)
+        """
+        if len(documents) < 2:
+            return await asyncio.to_thread(self.analyze_document_batch, documents, analysis_type)
+        
+        try:
+            logger.info(f"Analyzing {len(documents)} documents concurrently with type: {analysis_type}")
+            
+            semaphore = asyncio.Semaphore(self.batch_concurrency)
+            # Comparison maps each document to its key points, then reduces them below
+            map_type = "extract_key_points" if analysis_type == "compare" else analysis_type
+            
+            async def analyze(document: str) -> str:
+                async with semaphore:
+                    return await self._acall_openai(
+                        messages=self._document_analysis_messages(document, map_type),
+                        max_tokens=DOCUMENT_ANALYSIS_MAX_TOKENS,
+                        reasoning_effort=self._analysis_reasoning_effort(map_type)
+                    )
+            
+            analyses = await asyncio.gather(*(analyze(doc) for doc in documents))
+            combined = "\n\n---\n\n".join(
+                f"Document {i}:\n{analysis}" for i, analysis in enumerate(analyses, 1)
+            )
+            
+            if analysis_type == "compare":
+                combined = await self._acall_openai(
+                    messages=[
+                        self._system_msg,
+                        {"role": "user", "content": f"""Compare the following {len(documents)} documents using their extracted key points.
+
+{combined}
+
+Provide a compare of these documents: similarities, differences and contradictions."""}
+                    ],
+                    max_tokens=DOCUMENT_ANALYSIS_MAX_TOKENS,
+                    reasoning_effort=self._analysis_reasoning_effort(analysis_type)
+                )
+            
+            return {
+                "success": True,
+                "analysis": combined,
+                "analyses": analyses,
+                "documents_analyzed": len(documents),
+                "analysis_type": analysis_type,
+                "method": "parallel",
+                "model": self.model
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in parallel batch analysis: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def submit_document_batch(self, documents: List[str], analysis_type: str = "summary") -> Dict[str, Any]:
+        """
+        Submit per-document analyses to the OpenAI Batch API (non-interactive, half price)
+        
+        Args:
+            documents: List of document texts
+            analysis_type: Type of analysis (summary, extract_key_points)
+            
+        Returns:
+            {"success": bool, "batch_id": str, "documents_submitted": int}
+        """
+        try:
+            requests = [
+                json.dumps({
+                    "custom_id": f"doc-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._build_params(
+                        self._document_analysis_messages(document, analysis_type),
+                        None, "medium", self._analysis_reasoning_effort(analysis_type),
+                        DOCUMENT_ANALYSIS_MAX_TOKENS, None
+                    )
+                })
+                for i, document in enumerate(documents)
+            ]
+            
+            batch_file = self.client.files.create(
+                file=("documents.jsonl", "\n".join(requests).encode()),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            logger.info(f"Submitted batch {batch.id} with {len(documents)} documents")
+            
+            return {
+                "success": True,
+                "batch_id": batch.id,
+                "documents_submitted": len(documents)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error submitting document batch: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def get_document_batch_results(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Poll a batch submitted with submit_document_batch
+        
+        Returns:
+            {"success": bool, "status": str, "analyses": list (in document order, once completed)}
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            
+            if batch.status != "completed":
+                return {"success": True, "status": batch.status, "analyses": None}
+            
+            output = self.client.files.content(batch.output_file_id).text
+            
+            analyses = {}
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                index = int(item["custom_id"].split("-", 1)[1])
+                body = (item.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or [{}]
+                analyses[index] = choices[0].get("message", {}).get("content")
+            
+            return {
+                "success": True,
+                "status": batch.status,
+                "analyses": [analyses.get(i) for i in range(batch.request_counts.total)]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fetching document batch {batch_id}: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _analysis_reasoning_effort(self, analysis_type: str) -> str:
+        """Reasoning effort for a batch analysis (llm.batch_reasoning_effort overrides the per-type default)"""
+        return self.batch_reasoning_effort or REASONING_BY_ANALYSIS_TYPE.get(analysis_type, "medium")
+    
+    def _document_analysis_messages(self, document: str, analysis_type: str) -> List[Dict[str, str]]:
+        """Messages analyzing a single document"""
+        return [
+            self._system_msg,
+            {"role": "user", "content": f"""Analyze the following document.
+
+Analysis Type: {analysis_type}
+
+{document}
+
+Provide a {analysis_type} of this document."""}
+        ]
+    
     def clear_memory(self):
         """Clear conversation memory"""
         if self.memory:
@@ -442,5 +941,17 @@ Provide a {analysis_type} of these documents."""}
             logger.info("Conversation memory cleared")
 
 
-# Global instance
-text_agent = TextAgent()
+# Global instance (constructed on first access, see PEP 562)
+_text_agent = None
+_text_agent_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    if name == "text_agent":
+        global _text_agent
+        if _text_agent is None:
+            with _text_agent_lock:
+                if _text_agent is None:
+                    _text_agent = TextAgent()
+        return _text_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
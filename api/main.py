@@ -1,13 +1,43 @@
 #This makes the api folder a Python package and can expose key components.
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from api.routes import health, query, upload
+from api.dependencies import get_text_agent, get_image_agent, get_audio_agent, get_orchestrator
+from config.settings import settings
+from utils.http_client import aclose_http_clients
+from utils.logger import logger
+import asyncio
 import uvicorn
 
+
+async def warm_agents():
+    """Construct the agents in parallel so the first requests don't pay their startup cost"""
+    getters = [get_text_agent, get_image_agent, get_audio_agent, get_orchestrator]
+    results = await asyncio.gather(
+        *(asyncio.to_thread(getter) for getter in getters), return_exceptions=True
+    )
+    for getter, result in zip(getters, results):
+        if isinstance(result, Exception):
+            # The agent is retried lazily on its first request
+            logger.error(f"Warmup failed for {getter.__name__}: {result}")
+    logger.info("Agents warmed up")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.get('api.warm_agents', True):
+        await warm_agents()
+    yield
+    await aclose_http_clients()
+
 app = FastAPI(
     title="AURA API",
     description="Multi-Agent AI System Backend",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes responses (long answers, source lists) much faster than json
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -1,7 +1,15 @@
+import sys
 from fastapi import APIRouter
 
 router = APIRouter()
 
 @router.get("/")
 async def health_check():
-    return {"status": "healthy", "service": "AURA API"}
+    health = {"status": "healthy", "service": "AURA API"}
+    
+    # Report embedding cache stats only once it's loaded (importing it loads the model)
+    embedding_wrapper = sys.modules.get("utils.embedding_wrapper")
+    if embedding_wrapper is not None:
+        health["embedding_cache"] = embedding_wrapper.cached_embeddings.stats()
+    
+    return health
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
-from api.schemas import QueryRequest, AgentResponse
-from api.dependencies import get_orchestrator
+from fastapi.responses import StreamingResponse
+from api.schemas import QueryRequest, AgentResponse, StreamEvent
+from api.dependencies import get_orchestrator, get_text_agent
 from utils.logger import logger
 
 router = APIRouter()
@@ -26,8 +27,11 @@ async def process_query(
         if request.history and len(request.history) > 0:
             input_params["chat_history"] = request.history
         
+        if request.top_k is not None:
+            input_params["top_k"] = request.top_k
+        
         # Process with orchestrator
-        result = orchestrator.process(**input_params)
+        result = await orchestrator.aprocess(**input_params)
         
         # Check if there was an error
         if not result.get("success", False):
@@ -54,3 +58,28 @@ async def process_query(
     except Exception as e:
         logger.error(f"Unexpected error in query endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/stream")
+async def stream_query(
+    request: QueryRequest,
+    text_agent = Depends(get_text_agent)
+):
+    """
+    Answer a text query as server-sent events.
+    
+    Emits the retrieved sources first, then the answer token by token, then a
+    final "done" event (see StreamEvent).
+    """
+    logger.info(f"Streaming query: {request.query[:50]}...")
+    
+    async def events():
+        async for event in text_agent.astream({
+            "query": request.query,
+            "use_rag": request.use_rag,
+            "top_k": request.top_k
+        }):
+            yield f"data: {StreamEvent(**event).model_dump_json(exclude_none=True)}\n\n"
+        yield f"data: {StreamEvent(done=True).model_dump_json(exclude_none=True)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from api.schemas import AgentResponse
 from api.dependencies import get_image_agent, get_audio_agent, validate_file_size
-import shutil
+import aiofiles.tempfile
+import asyncio
 import os
-import tempfile
 
 router = APIRouter()
 
+# Bytes read from the upload per step (memory per upload stays at this size)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 @router.post("/analyze", response_model=AgentResponse)
 async def analyze_file(
     file: UploadFile = File(...),
@@ -17,15 +20,6 @@ async def analyze_file(
 ):
     tmp_path = None
     try:
-        # Validate file size (50MB max)
-        file_size = 0
-        content = await file.read()
-        file_size = len(content)
-        validate_file_size(file_size)
-        
-        # Reset file pointer after reading
-        await file.seek(0)
-        
         # 1. Identify file type
         filename = file.filename
         ext = os.path.splitext(filename)[1].lower()
@@ -36,17 +30,21 @@ async def analyze_file(
         if not (is_image or is_audio):
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
 
-        # 2. Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            shutil.copyfileobj(file.file, tmp)
+        # 2. Save to temp file in chunks, enforcing the size limit (50MB max) as we go
+        async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, suffix=ext) as tmp:
             tmp_path = tmp.name
+            file_size = 0
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                validate_file_size(file_size)
+                await tmp.write(chunk)
 
-        # 3. Route to appropriate agent
+        # 3. Route to appropriate agent (off the event loop, so other requests keep being served)
         result = {}
         
         if is_image:
             analysis_mode = "describe" if task_type == "auto" else task_type
-            result = image_agent.process({
+            result = await image_agent.aprocess({
                 "image_path": tmp_path,
                 "query": query,
                 "analysis_type": analysis_mode
@@ -54,7 +52,8 @@ async def analyze_file(
             
         elif is_audio:
             analysis_mode = "transcribe" if task_type == "auto" else task_type
-            result = audio_agent.process({
+            # Whisper is CPU/GPU-bound, hence a worker thread
+            result = await asyncio.to_thread(audio_agent.process, {
                 "audio_path": tmp_path,
                 "query": query,
                 "analysis_type": analysis_mode
@@ -68,6 +67,9 @@ async def analyze_file(
             metadata=result.get("metadata")
         )
 
+    except HTTPException:
+        raise
+        
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
         
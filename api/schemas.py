@@ -10,16 +10,25 @@ class QueryRequest(BaseModel):
     query: str = Field(..., description="The query text to process")
     use_rag: bool = Field(default=True, description="Whether to use RAG for context")
     history: Optional[List[Dict[str, str]]] = Field(default=None, description="Chat history for context")
+    top_k: Optional[int] = Field(default=None, ge=1, le=50, description="Documents to retrieve (server default if omitted)")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "query": "What is AURA?",
                 "use_rag": True,
-                "history": None
+                "history": None,
+                "top_k": None
             }
         }
 
+class StreamEvent(BaseModel):
+    """One server-sent event of a streamed response (exactly one field is set)"""
+    sources: Optional[List[Dict[str, Any]]] = None
+    token: Optional[str] = None
+    error: Optional[str] = None
+    done: Optional[bool] = None
+
 class AgentResponse(BaseResponse):
     response: str
     query_type: Optional[str] = None
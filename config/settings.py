@@ -18,6 +18,8 @@ class Settings:
     def __init__(self):
         self.config_path = Path(__file__).parent / "config.yaml"
         self.config = self._load_config()
+        # Every dot-notation key (leaves and sections), so get() is one dict lookup
+        self._flat = self._flatten(self.config)
         self._validate_env_vars()
     
     def _load_config(self) -> Dict[str, Any]:
@@ -30,6 +32,16 @@ class Settings:
         except yaml.YAMLError as e:
             raise Exception(f"Error parsing configuration file: {e}")
     
+    def _flatten(self, config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """Map "a.b.c" keys to values for every nested key in config"""
+        flat = {}
+        for key, value in (config or {}).items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(self._flatten(value, f"{path}."))
+        return flat
+    
     def _validate_env_vars(self):
         """Validate that required environment variables are set"""
         required_vars = [
@@ -40,6 +52,10 @@ class Settings:
             'SUPABASE_KEY',
         ]
         
+        # Pinecone isn't used with the local vector store
+        if os.getenv('AURA_LOCAL_VECTORS') == '1':
+            required_vars = [var for var in required_vars if not var.startswith('PINECONE_')]
+        
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         
         if missing_vars:
@@ -76,16 +92,7 @@ class Settings:
     # Configuration getters
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot notation key"""
-        keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k, default)
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     def get_llm_config(self) -> Dict[str, Any]:
         """Get LLM configuration"""
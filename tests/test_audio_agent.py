@@ -57,7 +57,7 @@ def test_transcribe():
         if result["success"]:
             logger.info(f"Transcript: {result['response'][:200]}...")  # First 200 chars
             logger.info(f"Language: {result['metadata']['language']}")
-            logger.info(f"Segments: {result['metadata']['segments']}")
+            logger.info(f"Segments: {len(result['metadata']['segments'])}")
             return True
         else:
             logger.error(f"Transcription failed: {result.get('error')}")
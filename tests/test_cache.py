@@ -0,0 +1,153 @@
+"""Test persistent LRU cache"""
+
+import tempfile
+import time
+from utils.cache import PersistentLRUCache
+from utils.llm_cache import LLMCache
+from utils.logger import logger
+
+def test_get_set():
+    """Test basic get/set round trip"""
+    logger.info("Testing cache get/set...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PersistentLRUCache("test", max_entries=4, cache_dir=cache_dir)
+
+        assert cache.get("missing") is None
+
+        cache.set("key", {"response": "hello", "metadata": {"language": "en"}})
+        assert cache.get("key") == {"response": "hello", "metadata": {"language": "en"}}
+
+    return True
+
+def test_lru_eviction():
+    """Test least recently used entries are evicted"""
+    logger.info("Testing cache eviction...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PersistentLRUCache("test", max_entries=2, cache_dir=cache_dir)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    return True
+
+def test_persistence():
+    """Test entries survive a new cache instance"""
+    logger.info("Testing cache persistence...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PersistentLRUCache("test", max_entries=4, cache_dir=cache_dir)
+        cache.set("key", "value")
+
+        reopened = PersistentLRUCache("test", max_entries=4, cache_dir=cache_dir)
+        assert reopened.get("key") == "value"
+
+    return True
+
+def test_read_recency_persisted():
+    """Test memory hits still protect entries from SQLite eviction"""
+    logger.info("Testing cache read recency...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PersistentLRUCache("test", max_entries=2, cache_dir=cache_dir)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # Memory hit, recorded for the next write
+        cache.set("c", 3)
+
+        reopened = PersistentLRUCache("test", max_entries=2, cache_dir=cache_dir)
+        assert reopened.get("a") == 1
+        assert reopened.get("b") is None
+
+    return True
+
+def test_llm_cache_exact():
+    """Test LLM cache keys depend on model, prompt and parameters"""
+    logger.info("Testing LLM cache exact match...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = LLMCache("test_llm", max_entries=4, cache_dir=cache_dir)
+
+        key = LLMCache.make_key("gpt-5-mini", [{"role": "user", "content": "hi"}], max_tokens=100)
+        assert key == LLMCache.make_key("gpt-5-mini", [{"role": "user", "content": "hi"}], max_tokens=100)
+        assert key != LLMCache.make_key("gpt-5-mini", [{"role": "user", "content": "hi"}], max_tokens=200)
+
+        assert cache.get(key) is None
+        cache.set(key, "hello")
+        assert cache.get(key) == "hello"
+
+    return True
+
+def test_llm_cache_semantic_scope():
+    """Test semantic hits only match entries in the same scope"""
+    logger.info("Testing LLM cache semantic scoping...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = LLMCache("test_llm", max_entries=4, similarity_threshold=0.95, cache_dir=cache_dir)
+
+        key = LLMCache.make_key("gpt-5-mini", "What is AURA?")
+        cache.set(key, "answer", "What is AURA?", scope="rag", vector=[1.0, 0.0, 0.0])
+
+        other_key = LLMCache.make_key("gpt-5-mini", "what is aura")
+        near = [0.99, 0.05, 0.0]
+        assert cache.get(other_key, "what is aura", scope="rag", vector=near) == "answer"
+        assert cache.get(other_key, "what is aura", scope="direct", vector=near) is None
+        assert cache.get(other_key, "unrelated", scope="rag", vector=[0.0, 1.0, 0.0]) is None
+
+    return True
+
+def test_llm_cache_ttl():
+    """Test semantic and exact entries expire after their TTL"""
+    logger.info("Testing LLM cache TTL...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = LLMCache("test_llm", max_entries=4, cache_dir=cache_dir, semantic_ttl=0.05)
+        key = LLMCache.make_key("gpt-5-mini", "What is AURA?")
+        cache.set(key, "answer", "What is AURA?", vector=[1.0, 0.0])
+        time.sleep(0.1)
+        other_key = LLMCache.make_key("gpt-5-mini", "what is aura")
+        assert cache.get(other_key, "what is aura", vector=[1.0, 0.0]) is None
+        assert cache.get(key) == "answer"  # Exact tier has no TTL here
+
+        expiring = LLMCache("test_llm_ttl", max_entries=4, cache_dir=cache_dir, ttl=0.05)
+        expiring.set(key, "answer")
+        assert expiring.get(key) == "answer"
+        time.sleep(0.1)
+        assert expiring.get(key) is None
+
+    return True
+
+if __name__ == "__main__":
+    logger.info("Starting Cache tests...")
+    logger.info("="*50)
+
+    tests = [
+        ("Get/Set", test_get_set),
+        ("LRU Eviction", test_lru_eviction),
+        ("Persistence", test_persistence),
+        ("Read Recency Persisted", test_read_recency_persisted),
+        ("LLM Cache Exact Match", test_llm_cache_exact),
+        ("LLM Cache Semantic Scope", test_llm_cache_semantic_scope),
+        ("LLM Cache TTL", test_llm_cache_ttl)
+    ]
+
+    for test_name, test_func in tests:
+        logger.info(f"\nRunning: {test_name}")
+        try:
+            if test_func():
+                logger.info(f"[PASS] {test_name}")
+            else:
+                logger.error(f"[FAIL] {test_name}")
+        except Exception as e:
+            logger.error(f"[ERROR] {test_name}: {str(e)}")
+
+    logger.info("\n" + "="*50)
+    logger.info("All tests completed!")
@@ -147,6 +147,33 @@ def test_analyze():
         return False
 
 
+def test_split_stacked_data():
+    """Test stacked-image OCR words are assigned to the image they came from"""
+    logger.info("Testing stacked OCR splitting...")
+    
+    # Three images stacked at these top offsets; the middle one has no words
+    offsets = [0, 100, 250]
+    data = {
+        "text": ["first", "line", "", "third", "part"],
+        "top": [5, 99, 120, 250, 300],
+        "conf": [90, 80, -1, 70, 60],
+        "block_num": [1, 1, 2, 3, 3],
+        "par_num": [1, 1, 1, 1, 1],
+        "line_num": [1, 1, 1, 1, 2]
+    }
+    
+    results = image_agent._split_stacked_data(data, offsets)
+    
+    assert len(results) == 3
+    assert results[0]["text"] == "first line"
+    assert results[0]["confidence"] == 85
+    assert results[1]["text"] == ""
+    assert results[1]["confidence"] == 0.0
+    assert results[2]["text"] == "third\npart"
+    assert results[2]["confidence"] == 65
+    
+    return True
+
 if __name__ == "__main__":
     logger.info("Starting Image Agent tests...")
     logger.info("="*50)
@@ -156,7 +183,8 @@ if __name__ == "__main__":
         ("Multi-Engine OCR", test_ocr),
         ("Single Engine OCR", test_ocr_single_engine),
         ("Question Answering", test_question_answering),
-        ("Custom Analysis", test_analyze)
+        ("Custom Analysis", test_analyze),
+        ("Stacked OCR Splitting", test_split_stacked_data)
     ]
     
     for test_name, test_func in tests:
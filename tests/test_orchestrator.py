@@ -248,6 +248,30 @@ def test_error_handling():
         return False
 
 
+def test_stream_agent_error():
+    """Test astream yields the error when the agent fails"""
+    logger.info("Testing streamed agent error...")
+    
+    import asyncio
+    from agents.text_agent import text_agent
+    
+    async def failing_aprocess(input_data):
+        return {"success": False, "error": "Pinecone unavailable"}
+    
+    async def collect():
+        return [chunk async for chunk in orchestrator.astream("What is AURA?")]
+    
+    text_agent.aprocess = failing_aprocess
+    try:
+        chunks = asyncio.run(collect())
+    finally:
+        del text_agent.aprocess
+    
+    assert chunks == ["Error: Pinecone unavailable"], chunks
+    
+    return True
+
+
 def test_workflow_tracking():
     """Test workflow step tracking"""
     logger.info("Testing workflow tracking...")
@@ -278,6 +302,24 @@ def test_workflow_tracking():
         return False
 
 
+def test_single_base_agent():
+    """Test that all agents share one canonical BaseAgent definition"""
+    logger.info("Testing BaseAgent identity...")
+    
+    import agents
+    from agents.base_agent import BaseAgent
+    
+    assert agents.BaseAgent is BaseAgent
+    
+    for agent in (agents.text_agent, agents.image_agent, agents.audio_agent):
+        assert isinstance(agent, BaseAgent), f"{agent!r} is not a BaseAgent"
+    
+    # Lazy audio_agent export must stay the same instance on repeated access
+    assert agents.audio_agent is agents.audio_agent
+    
+    return True
+
+
 if __name__ == "__main__":
     logger.info("Starting Orchestrator tests...")
     logger.info("="*60)
@@ -290,7 +332,9 @@ if __name__ == "__main__":
         ("Multi-Modal (Text + Audio)", test_multi_modal_text_audio),
         ("Classification Accuracy", test_classification_accuracy),
         ("Error Handling", test_error_handling),
-        ("Workflow Tracking", test_workflow_tracking)
+        ("Streamed Agent Error", test_stream_agent_error),
+        ("Workflow Tracking", test_workflow_tracking),
+        ("Single BaseAgent", test_single_base_agent)
     ]
     
     passed = 0
@@ -0,0 +1,105 @@
+"""Test OpenAI retry policy"""
+
+import asyncio
+import httpx
+import openai
+from utils.retry import aopenai_retry, openai_retry
+from utils.logger import logger
+
+def _rate_limit_error() -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.RateLimitError(
+        "Rate limit reached", response=httpx.Response(429, request=request), body=None
+    )
+
+def _bad_request_error() -> openai.BadRequestError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.BadRequestError(
+        "Invalid request", response=httpx.Response(400, request=request), body=None
+    )
+
+class FakeAsyncCompletions:
+    """Mimics AsyncCompletions.create: a sync callable returning a coroutine that fails on await"""
+
+    def __init__(self, failures: int, error_factory=_rate_limit_error):
+        self.failures = failures
+        self.error_factory = error_factory
+        self.calls = 0
+
+    def create(self, **params):
+        self.calls += 1
+        fail = self.calls <= self.failures
+
+        async def response():
+            if fail:
+                raise self.error_factory()
+            return "ok"
+
+        return response()
+
+def test_async_rate_limit_retried():
+    """Test a RateLimitError raised on await is retried"""
+    logger.info("Testing async retry...")
+
+    completions = FakeAsyncCompletions(failures=2)
+    result = asyncio.run(aopenai_retry(completions.create)(model="gpt-5-mini"))
+
+    assert result == "ok"
+    assert completions.calls == 3
+
+    return True
+
+def test_async_bad_request_not_retried():
+    """Test non-transient errors fail on the first attempt"""
+    logger.info("Testing async non-retryable error...")
+
+    completions = FakeAsyncCompletions(failures=1, error_factory=_bad_request_error)
+    try:
+        asyncio.run(aopenai_retry(completions.create)(model="gpt-5-mini"))
+        return False
+    except openai.BadRequestError:
+        pass
+
+    assert completions.calls == 1
+
+    return True
+
+def test_sync_rate_limit_retried():
+    """Test sync calls are retried on RateLimitError"""
+    logger.info("Testing sync retry...")
+
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        if len(calls) < 3:
+            raise _rate_limit_error()
+        return "ok"
+
+    assert openai_retry(create)(model="gpt-5-mini") == "ok"
+    assert len(calls) == 3
+
+    return True
+
+if __name__ == "__main__":
+    logger.info("Starting Retry tests...")
+    logger.info("="*50)
+
+    tests = [
+        ("Async Rate Limit Retried", test_async_rate_limit_retried),
+        ("Async Bad Request Not Retried", test_async_bad_request_not_retried),
+        ("Sync Rate Limit Retried", test_sync_rate_limit_retried)
+    ]
+
+    for test_name, test_func in tests:
+        logger.info(f"\nRunning: {test_name}")
+        try:
+            if test_func():
+                logger.info(f"[PASS] {test_name}")
+            else:
+                logger.error(f"[FAIL] {test_name}")
+        except Exception as e:
+            logger.error(f"[ERROR] {test_name}: {str(e)}")
+
+    logger.info("\n" + "="*50)
+    logger.info("All tests completed!")
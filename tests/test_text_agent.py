@@ -1,5 +1,6 @@
 """Test Text Agent"""
 
+import json
 from agents.text_agent import text_agent
 from utils.logger import logger
 from utils.pinecone_store import pinecone_store
@@ -63,6 +64,91 @@ def test_batch_analysis():
         logger.error(f"Failed: {result.get('error')}")
         return False
 
+def test_stream_event_order():
+    """Test the stream endpoint emits sources, then tokens, then done"""
+    logger.info("Testing streaming event order...")
+    
+    from fastapi.testclient import TestClient
+    from langchain_core.documents import Document
+    from api.dependencies import get_text_agent
+    from api.main import app
+    
+    tokens = ["AURA ", "is a ", "multi-agent system."]
+    
+    class FakeAnswerChain:
+        async def astream(self, inputs):
+            for token in tokens:
+                yield token
+    
+    async def fake_retrieve(query, query_embedding=None, top_k=None, filters=None, retrieved_docs=None):
+        return [Document(page_content="AURA is a multi-agent system.", metadata={"id": "doc-1", "score": 0.9})]
+    
+    def fake_prepare(input_data):
+        return {
+            "query": input_data["query"],
+            "use_rag": True,
+            "use_memory": False,
+            "input_data": input_data,
+            "query_embedding": None,
+            "cache_key": None,
+            "scope": None
+        }
+    
+    answer_chain = text_agent.answer_chain
+    text_agent._aretrieve = fake_retrieve
+    text_agent._prepare_request = fake_prepare
+    text_agent.answer_chain = FakeAnswerChain()
+    app.dependency_overrides[get_text_agent] = lambda: text_agent
+    try:
+        response = TestClient(app).post("/api/query/stream", json={"query": "What is AURA?"})
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+    finally:
+        del text_agent._aretrieve
+        del text_agent._prepare_request
+        text_agent.answer_chain = answer_chain
+        app.dependency_overrides.clear()
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert list(events[0]) == ["sources"]
+    assert events[0]["sources"][0]["id"] == "doc-1"
+    assert [event["token"] for event in events[1:-1]] == tokens
+    assert events[-1] == {"done": True}
+    
+    return True
+
+def test_prefetched_docs_skip_search():
+    """Test matches passed in as retrieved_docs are used without searching"""
+    logger.info("Testing prefetched retrieval...")
+    
+    class NoSearch:
+        def similarity_search_by_vector(self, *args, **kwargs):
+            raise AssertionError("vector store searched")
+        
+        similarity_search = similarity_search_by_vector
+    
+    matches = [{
+        "id": "doc-1",
+        "score": 0.9,
+        "text": "AURA is a multi-agent system.",
+        "metadata": {"text": "AURA is a multi-agent system.", "source": "readme"}
+    }]
+    
+    vectorstore = text_agent.vectorstore
+    text_agent.vectorstore = NoSearch()
+    try:
+        docs = text_agent._retrieve("What is AURA?", [0.1, 0.2], retrieved_docs=matches)
+    finally:
+        text_agent.vectorstore = vectorstore
+    
+    assert [doc.page_content for doc in docs] == ["AURA is a multi-agent system."]
+    assert docs[0].metadata == {"source": "readme", "id": "doc-1", "score": 0.9}
+    assert text_agent._langchain_sources(docs)[0]["id"] == "doc-1"
+    
+    return True
+
 if __name__ == "__main__":
     logger.info("Starting Text Agent tests...")
     logger.info("="*50)
@@ -70,7 +156,9 @@ if __name__ == "__main__":
     tests = [
         ("Simple Query", test_simple_query),
         ("RAG Query", test_rag_query),
-        ("Batch Analysis", test_batch_analysis)
+        ("Batch Analysis", test_batch_analysis),
+        ("Stream Event Order", test_stream_event_order),
+        ("Prefetched Docs Skip Search", test_prefetched_docs_skip_search)
     ]
     
     for test_name, test_func in tests:
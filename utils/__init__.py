@@ -1,6 +1,8 @@
 """Utility modules for AURA"""
 
 from .logger import logger, setup_logger
+from .cache import PersistentLRUCache
+from .llm_cache import LLMCache
 from .embedding_generator import embedding_generator
 from .pinecone_store import pinecone_store
 from .supabase_client import supabase_client
@@ -9,6 +11,8 @@ from .document_processor import document_processor
 __all__ = [
     'logger',
     'setup_logger',
+    'PersistentLRUCache',
+    'LLMCache',
     'embedding_generator',
     'pinecone_store',
     'supabase_client',
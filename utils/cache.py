@@ -0,0 +1,147 @@
+"""
+Persistent LRU Cache for AURA
+In-memory LRU backed by SQLite so cached results survive process restarts
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from config.settings import settings
+from utils.logger import logger
+
+
+class PersistentLRUCache:
+    """LRU cache with an SQLite backing store under the AURA cache directory"""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 256,
+        cache_dir: Optional[str] = None,
+        persist: bool = True
+    ):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache name (used as the SQLite file name)
+            max_entries: Maximum entries kept before least recently used are evicted
+            cache_dir: Optional override for the cache directory
+            persist: False keeps entries in memory only (for data that goes stale)
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        # Memory hits since the last write, with their access time; SQLite recency is
+        # only updated in batch before evicting rows, so reads never touch the disk
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if not persist:
+            return
+
+        cache_dir = Path(cache_dir or settings.get('cache.dir', '~/.cache/aura')).expanduser()
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self.db_path = cache_dir / f"{name}.sqlite3"
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.commit()
+            logger.info(f"Cache '{name}' initialized at {self.db_path}")
+        except Exception as e:
+            # Fall back to memory-only caching
+            logger.warning(f"Persistent cache '{name}' unavailable, using memory only: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached value, or None on miss"""
+        with self._lock:
+            value = self._memory.get(key)
+
+            if value is not None:
+                self._memory.move_to_end(key)
+                if self._conn:
+                    self._touched[key] = time.time()
+                return value
+
+            if not self._conn:
+                return None
+
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value = json.loads(row[0])
+
+                # Disk-tier hit: loaded into memory, recency recorded like a memory hit
+                self._touched[key] = time.time()
+                self._remember(key, value)
+                return value
+
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' read failed: {e}")
+                return None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value"""
+        with self._lock:
+            self._remember(key, value)
+
+            if not self._conn:
+                return
+
+            try:
+                # Bring SQLite recency up to date first, so eviction keeps recently read rows
+                self._touched.pop(key, None)
+                if self._touched:
+                    self._conn.executemany(
+                        "UPDATE entries SET accessed = ? WHERE key = ?",
+                        [(accessed, touched) for touched, accessed in self._touched.items()]
+                    )
+                    self._touched.clear()
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, accessed) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time())
+                )
+                # Evict least recently used rows beyond max_entries
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key NOT IN "
+                    "(SELECT key FROM entries ORDER BY accessed DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+                self._conn.commit()
+
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' write failed: {e}")
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._conn:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.commit()
+        logger.info(f"Cache '{self.name}' cleared")
+
+    def _remember(self, key: str, value: Any):
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._memory)
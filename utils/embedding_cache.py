@@ -0,0 +1,92 @@
+"""
+Embedding cache for AURA
+LRU cache with TTL in front of a LangChain embedder, so repeated queries and
+document chunks are not re-embedded
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+from config.settings import settings
+
+
+class CachedEmbeddings(Embeddings):
+    """Wrap a LangChain Embeddings with a SHA-256-keyed LRU cache (entries expire after ttl seconds)"""
+
+    def __init__(self, embeddings: Embeddings, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize cache
+
+        Args:
+            embeddings: Underlying embedder
+            max_entries: Maximum cached vectors before least recently used are evicted
+            ttl: Seconds a cached vector stays valid
+        """
+        self.embeddings = embeddings
+        self.max_entries = max_entries or settings.get('embeddings.cache_size', 10000)
+        self.ttl = ttl or settings.get('embeddings.cache_ttl', 3600)
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query"""
+        key = self._key(text)
+        vector = self._get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._set(key, vector)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple documents, sending only cache misses (in one batch) to the embedder"""
+        keys = [self._key(text) for text in texts]
+        vectors = [self._get(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+                self._set(keys[i], vector)
+
+        return vectors
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(text.encode()).digest()
+
+    def _get(self, key: bytes) -> Optional[List[float]]:
+        """Cached vector, or None if missing or expired"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._cache[key]
+            self.misses += 1
+            return None
+
+    def _set(self, key: bytes, vector: List[float]):
+        with self._lock:
+            self._cache[key] = (time.monotonic(), vector)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
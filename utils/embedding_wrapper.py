@@ -5,6 +5,7 @@ Embedding wrapper for LangChain compatibility
 from typing import List
 from langchain_core.embeddings import Embeddings
 from utils.embedding_generator import embedding_generator
+from utils.embedding_cache import CachedEmbeddings
 
 
 class SentenceTransformerEmbeddings(Embeddings):
@@ -22,5 +23,6 @@ class SentenceTransformerEmbeddings(Embeddings):
         return self.model.encode([text])[0].tolist()
 
 
-# Global instance
+# Global instances
 langchain_embeddings = SentenceTransformerEmbeddings(embedding_generator.model)
+cached_embeddings = CachedEmbeddings(langchain_embeddings)
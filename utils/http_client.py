@@ -0,0 +1,81 @@
+"""
+Shared HTTP clients for AURA
+One pooled HTTP/2 connection pool for all OpenAI traffic, so agents reuse warm
+connections instead of each paying its own TCP and TLS handshakes
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI
+from config.settings import settings
+
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_sync_client: Optional[httpx.Client] = None
+# httpx async clients are bound to the event loop they first run on, so there is
+# one per loop (the API's loop, and the background loop behind sync process())
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.get('llm.http_max_connections', 200),
+        max_keepalive_connections=settings.get('llm.http_max_keepalive', 50),
+        keepalive_expiry=60
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide pooled sync client"""
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(http2=True, limits=_limits(), timeout=HTTP_TIMEOUT)
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Pooled async client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = httpx.AsyncClient(http2=True, limits=_limits(), timeout=HTTP_TIMEOUT)
+        return client
+
+
+def async_openai_client() -> AsyncOpenAI:
+    """AsyncOpenAI client for the running event loop, over its shared connection pool"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_openai_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=0,  # Retried by openai_retry
+            http_client=get_async_http_client()
+        )
+        with _lock:
+            client = _async_openai_clients.setdefault(loop, client)
+    return client
+
+
+async def aclose_http_clients():
+    """
+    Close the running loop's async client (on shutdown)
+
+    The sync client stays open: agents and ChatOpenAI hold it for the life of the
+    process, and the app may start again in the same process (e.g. TestClient).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        async_client = _async_clients.pop(loop, None)
+        _async_openai_clients.pop(loop, None)
+
+    if async_client is not None:
+        await async_client.aclose()
@@ -0,0 +1,178 @@
+"""
+LLM Response Cache for AURA
+Exact-match cache on the full request, plus a semantic tier that reuses the
+response of a sufficiently similar earlier query
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from config.settings import settings
+from utils.cache import PersistentLRUCache
+from utils.logger import logger
+
+
+class LLMCache:
+    """Two-tier LLM response cache (exact SHA-256 key, then query embedding similarity)"""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+        persist: bool = True,
+        semantic_ttl: Optional[float] = None,
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache name (used as the SQLite file name)
+            max_entries: Maximum exact entries (and semantic entries per scope)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            cache_dir: Optional override for the cache directory
+            persist: False keeps exact entries in memory only
+            semantic_ttl: Seconds a query stays eligible for semantic hits
+            ttl: Seconds an exact entry stays valid (None keeps entries until evicted)
+        """
+        self.max_entries = max_entries or settings.get('cache.llm_cache_size', 1024)
+        self.similarity_threshold = similarity_threshold or settings.get('cache.semantic_threshold', 0.95)
+        self.semantic_ttl = semantic_ttl or settings.get('cache.semantic_ttl', 86400)
+        self.ttl = ttl
+        self._exact = PersistentLRUCache(name, self.max_entries, cache_dir, persist)
+
+        # Semantic tier (in memory): per scope, normalized query embeddings, their exact keys
+        # and insertion times
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._times: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, prompt: Any, **params) -> str:
+        """Build an exact-match key from the model, prompt (string or messages) and parameters"""
+        payload = json.dumps([model, prompt, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(
+        self,
+        key: str,
+        query: Optional[str] = None,
+        scope: str = "",
+        vector: Optional[Sequence[float]] = None
+    ) -> Optional[Any]:
+        """
+        Get a cached response, or None on miss
+
+        Args:
+            key: Exact-match key from make_key
+            query: If given, fall back to the most similar cached query in the same scope
+            scope: Semantic entries only match others with the same scope
+            vector: Precomputed embedding of query (skips embedding it again)
+        """
+        value = self._get_exact(key)
+        if value is not None or not query:
+            return value
+
+        similar_key = self._similar_key(query, scope, vector)
+        if similar_key is None:
+            return None
+
+        value = self._get_exact(similar_key)
+        if value is not None:
+            logger.info("Semantic cache hit")
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        query: Optional[str] = None,
+        scope: str = "",
+        vector: Optional[Sequence[float]] = None
+    ):
+        """Store a JSON-serializable response, indexing query (or its vector) for semantic lookups"""
+        # With a TTL, entries carry their wall-clock write time (persisted entries outlive the process)
+        self._exact.set(key, {"time": time.time(), "value": value} if self.ttl else value)
+
+        if not query:
+            return
+
+        try:
+            vector = self._embed(query, vector)
+        except Exception as e:
+            logger.warning(f"Semantic cache indexing failed: {e}")
+            return
+
+        with self._lock:
+            vectors = self._vectors.get(scope)
+            keys = self._keys.setdefault(scope, [])
+            times = self._times.get(scope, np.empty(0))
+            vectors = vector[None, :] if vectors is None else np.vstack([vectors, vector])
+            times = np.append(times, time.monotonic())
+            keys.append(key)
+
+            # Drop expired entries and the oldest beyond max_entries (entries are in insertion order)
+            start = max(int(np.searchsorted(times, time.monotonic() - self.semantic_ttl)), len(keys) - self.max_entries)
+            if start > 0:
+                vectors = vectors[start:]
+                times = times[start:]
+                del keys[:start]
+            self._vectors[scope] = vectors
+            self._times[scope] = times
+
+    def _get_exact(self, key: str) -> Optional[Any]:
+        """Exact-tier value, or None if missing or expired"""
+        entry = self._exact.get(key)
+        if entry is None or not self.ttl:
+            return entry
+        if time.time() - entry["time"] >= self.ttl:
+            return None
+        return entry["value"]
+
+    def _similar_key(self, query: str, scope: str, vector: Optional[Sequence[float]] = None) -> Optional[str]:
+        """Exact key of the most similar cached query, if above the threshold"""
+        with self._lock:
+            vectors = self._vectors.get(scope)
+            keys = list(self._keys.get(scope, []))
+            times = self._times.get(scope)
+        if vectors is None or not len(keys):
+            return None
+
+        try:
+            scores = vectors @ self._embed(query, vector)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+        # Expired entries can't match
+        scores = np.where(times >= time.monotonic() - self.semantic_ttl, scores, -1.0)
+
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return keys[best]
+
+    def _embed(self, text: str, vector: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Normalized query embedding (cosine similarity becomes a dot product)"""
+        if vector is None:
+            # Imported lazily so exact-only caches never load the embedding model
+            from utils.embedding_generator import embedding_generator
+            vector = embedding_generator.generate_embedding(text)
+
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._vectors.clear()
+            self._keys.clear()
+            self._times.clear()
+        self._exact.clear()
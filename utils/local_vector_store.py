@@ -0,0 +1,205 @@
+"""
+Local Vector Store for AURA
+Exact inner-product search over embeddings kept on disk, for development and
+offline use without Pinecone (enable with AURA_LOCAL_VECTORS=1)
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config.settings import settings
+from utils.logger import logger
+
+# Optional FAISS (falls back to a NumPy dot product)
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+class LocalVectorStore:
+    """Flat (exact) vector index: embeddings in a .npy file, chunk text and metadata in SQLite"""
+
+    def __init__(self, store_dir: Optional[str] = None):
+        """
+        Initialize store (vectors are loaded on first use)
+
+        Args:
+            store_dir: Optional override for the store directory
+        """
+        self.dimension = settings.get('pinecone.dimension', 384)
+        self.store_dir = Path(store_dir or settings.get('local_vectors.dir', '~/.cache/aura/vectors')).expanduser()
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.store_dir / "embeddings.npy"
+
+        self._conn = sqlite3.connect(str(self.store_dir / "chunks.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id TEXT PRIMARY KEY, pos INTEGER NOT NULL, text TEXT NOT NULL, metadata_json TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._vectors: Optional[np.ndarray] = None
+        # Chunk rows by position, loaded alongside the vectors
+        self._rows: Optional[Dict[int, Tuple[str, str, Dict[str, Any]]]] = None
+        self._index = None
+        self._lock = threading.Lock()
+
+        logger.info(f"Local vector store at {self.store_dir} (FAISS: {FAISS_AVAILABLE})")
+
+    def upsert(self, vectors: List[Tuple[str, Sequence[float], Dict[str, Any]]]):
+        """
+        Insert or update vectors
+
+        Args:
+            vectors: (id, embedding, metadata) tuples, as for Pinecone upsert
+        """
+        with self._lock:
+            stored = self._load()
+            for doc_id, embedding, metadata in vectors:
+                vector = self._normalize(embedding)
+                row = self._conn.execute("SELECT pos FROM chunks WHERE id = ?", (doc_id,)).fetchone()
+                if row is not None:
+                    pos = row[0]
+                    stored[pos] = vector
+                else:
+                    pos = len(stored)
+                    stored = np.vstack([stored, vector])
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO chunks (id, pos, text, metadata_json) VALUES (?, ?, ?, ?)",
+                    (doc_id, pos, metadata.get('text', ''), json.dumps(metadata))
+                )
+
+            self._save(stored)
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the most similar chunks
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            filter: Optional Pinecone-style metadata filter ($eq, $ne, $in, $nin)
+
+        Returns:
+            Matches in the same format as PineconeStore.query
+        """
+        with self._lock:
+            stored = self._load()
+            if not len(stored):
+                return []
+
+            # With a filter, rank everything and keep the first top_k that match
+            k = len(stored) if filter else min(top_k, len(stored))
+            query = self._normalize(vector)[None, :]
+
+            if FAISS_AVAILABLE:
+                if self._index is None:
+                    self._index = faiss.IndexFlatIP(self.dimension)
+                    self._index.add(stored)
+                scores, positions = self._index.search(query, k)
+                scores, positions = scores[0], positions[0]
+            else:
+                all_scores = stored @ query[0]
+                positions = np.argsort(-all_scores)[:k]
+                scores = all_scores[positions]
+
+            rows = self._load_rows()
+
+        matches = []
+        for score, pos in zip(scores, positions):
+            if int(pos) not in rows:
+                continue
+            doc_id, text, metadata = rows[int(pos)]
+            if filter and not self._matches(metadata, filter):
+                continue
+            matches.append({'id': doc_id, 'score': float(score), 'text': text, 'metadata': metadata})
+            if len(matches) == top_k:
+                break
+        return matches
+
+    def delete(self, doc_id: str):
+        """Delete a chunk by ID"""
+        with self._lock:
+            row = self._conn.execute("SELECT pos FROM chunks WHERE id = ?", (doc_id,)).fetchone()
+            if row is None:
+                return
+
+            pos = row[0]
+            self._conn.execute("DELETE FROM chunks WHERE id = ?", (doc_id,))
+            self._conn.execute("UPDATE chunks SET pos = pos - 1 WHERE pos > ?", (pos,))
+            self._save(np.delete(self._load(), pos, axis=0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics (same keys as PineconeStore.get_stats)"""
+        with self._lock:
+            return {
+                'total_vectors': len(self._load()),
+                'dimension': self.dimension,
+                'index_fullness': 0.0
+            }
+
+    def _load(self) -> np.ndarray:
+        """Stored vectors (loaded from disk once); call with the lock held"""
+        if self._vectors is None:
+            if self.vectors_path.exists():
+                self._vectors = np.load(self.vectors_path)
+            else:
+                self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+        return self._vectors
+
+    def _load_rows(self) -> Dict[int, Tuple[str, str, Dict[str, Any]]]:
+        """Chunk rows by position (loaded from SQLite once); call with the lock held"""
+        if self._rows is None:
+            self._rows = {
+                pos: (doc_id, text, json.loads(metadata_json))
+                for doc_id, pos, text, metadata_json in self._conn.execute(
+                    "SELECT id, pos, text, metadata_json FROM chunks"
+                )
+            }
+        return self._rows
+
+    def _save(self, vectors: np.ndarray):
+        """Persist vectors and chunk rows together; call with the lock held"""
+        np.save(self.vectors_path, vectors)
+        self._conn.commit()
+        self._vectors = vectors
+        self._rows = None
+        self._index = None
+
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        """Unit-length float32 vector (inner product becomes cosine similarity)"""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _matches(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+        """Whether metadata satisfies a Pinecone-style filter"""
+        for field, condition in filter.items():
+            value = metadata.get(field)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            for op, expected in condition.items():
+                if op == "$eq" and value != expected:
+                    return False
+                if op == "$ne" and value == expected:
+                    return False
+                if op == "$in" and value not in expected:
+                    return False
+                if op == "$nin" and value in expected:
+                    return False
+                if op not in ("$eq", "$ne", "$in", "$nin"):
+                    raise ValueError(f"Unsupported filter operator for local vectors: {op}")
+        return True
@@ -3,6 +3,8 @@ Pinecone Vector Store for AURA
 Handles all interactions with Pinecone vector database
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from pinecone import Pinecone, ServerlessSpec
 from config.settings import settings
@@ -20,6 +22,15 @@ class PineconeStore:
         self.dimension = settings.get('pinecone.dimension', 384)
         self.metric = settings.get('pinecone.metric', 'cosine')
         
+        # Development/offline mode: serve everything from a local index instead
+        self.local_store = None
+        if os.getenv('AURA_LOCAL_VECTORS') == '1':
+            from utils.local_vector_store import LocalVectorStore
+            self.local_store = LocalVectorStore()
+            self.index = None
+            logger.info("AURA_LOCAL_VECTORS set, using the local vector store instead of Pinecone")
+            return
+        
         logger.info("Initializing Pinecone connection...")
         try:
             # Initialize Pinecone
@@ -70,9 +81,12 @@ class PineconeStore:
             meta['text'] = text[:1000]  # Store first 1000 chars for reference
             
             # Upsert to Pinecone
-            self.index.upsert(
-                vectors=[(doc_id, embedding, meta)]
-            )
+            if self.local_store:
+                self.local_store.upsert([(doc_id, embedding, meta)])
+            else:
+                self.index.upsert(
+                    vectors=[(doc_id, embedding, meta)]
+                )
             
             logger.info(f"Successfully upserted document: {doc_id}")
             return True
@@ -107,7 +121,10 @@ class PineconeStore:
                 vectors.append((doc_id, embedding, metadata))
             
             # Batch upsert
-            self.index.upsert(vectors=vectors)
+            if self.local_store:
+                self.local_store.upsert(vectors)
+            else:
+                self.index.upsert(vectors=vectors)
             
             logger.info(f"Successfully upserted {len(documents)} documents")
             return len(documents)
@@ -116,7 +133,13 @@ class PineconeStore:
             logger.error(f"Error in batch upsert: {str(e)}")
             return 0
     
-    def query(self, query_text: str, top_k: int = 5, filter: Optional[Dict] = None) -> List[Dict[str, Any]]:
+    def query(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        filter: Optional[Dict] = None,
+        vector: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Query Pinecone for similar documents
         
@@ -124,13 +147,19 @@ class PineconeStore:
             query_text: Query text
             top_k: Number of results to return
             filter: Optional metadata filter
+            vector: Precomputed query embedding (skips embedding query_text)
             
         Returns:
             List of matching documents with scores
         """
         try:
-            # Generate query embedding
-            query_embedding = embedding_generator.generate_embedding(query_text)
+            # Generate query embedding unless the caller already has one
+            query_embedding = vector if vector is not None else embedding_generator.generate_embedding(query_text)
+            
+            if self.local_store:
+                matches = self.local_store.query(query_embedding, top_k, filter)
+                logger.info(f"Local query returned {len(matches)} results")
+                return matches
             
             # Query Pinecone
             results = self.index.query(
@@ -157,6 +186,45 @@ class PineconeStore:
             logger.error(f"Error querying Pinecone: {str(e)}")
             return []
     
+    def query_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter: Optional[Dict] = None,
+        vectors: Optional[List[List[float]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Query Pinecone for several queries at once
+        
+        All queries are embedded in one batch and the index queries are sent
+        concurrently (Pinecone takes one vector per query request).
+        
+        Args:
+            queries: Query texts
+            top_k: Number of results per query
+            filter: Optional metadata filter (applied to every query)
+            vectors: Precomputed query embeddings (skips embedding queries)
+            
+        Returns:
+            Matches for each query, in query order
+        """
+        if not queries:
+            return []
+        
+        try:
+            if vectors is None:
+                # Empty texts are dropped by generate_embeddings, which would misalign results
+                vectors = embedding_generator.generate_embeddings([query or " " for query in queries])
+        except Exception as e:
+            logger.error(f"Error embedding batch queries: {str(e)}")
+            return [[] for _ in queries]
+        
+        with ThreadPoolExecutor(max_workers=min(len(queries), settings.get('pinecone.query_concurrency', 8))) as pool:
+            return list(pool.map(
+                lambda args: self.query(args[0], top_k, filter, vector=args[1]),
+                zip(queries, vectors)
+            ))
+    
     def delete_document(self, doc_id: str) -> bool:
         """
         Delete a document from Pinecone
@@ -168,7 +236,10 @@ class PineconeStore:
             True if successful
         """
         try:
-            self.index.delete(ids=[doc_id])
+            if self.local_store:
+                self.local_store.delete(doc_id)
+            else:
+                self.index.delete(ids=[doc_id])
             logger.info(f"Deleted document: {doc_id}")
             return True
         except Exception as e:
@@ -178,6 +249,9 @@ class PineconeStore:
     def get_stats(self) -> Dict[str, Any]:
         """Get index statistics"""
         try:
+            if self.local_store:
+                return self.local_store.get_stats()
+            
             stats = self.index.describe_index_stats()
             return {
                 'total_vectors': stats.total_vector_count,
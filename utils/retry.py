@@ -0,0 +1,55 @@
+"""
+Retry policy for AURA
+Exponential backoff with jitter around OpenAI calls, for transient errors only
+"""
+
+import functools
+import logging
+from typing import Any, Awaitable, Callable
+import openai
+from tenacity import (
+    AsyncRetrying,
+    before_sleep_log,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential
+)
+from config.settings import settings
+from utils.logger import logger
+
+# Rate limits, timeouts, dropped connections and 5xx responses are worth retrying;
+# anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError
+)
+
+RETRY_POLICY = dict(
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    wait=wait_random_exponential(min=0.25, max=8),
+    stop=stop_after_attempt(settings.get('llm.max_attempts', 4)),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
+# Decorates sync callables (e.g. OpenAI(...).chat.completions.create)
+openai_retry = retry(**RETRY_POLICY)
+
+
+def aopenai_retry(create: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Async counterpart of openai_retry
+
+    AsyncOpenAI's create methods are sync wrappers returning a coroutine, so the
+    error only surfaces when it is awaited; the await happens inside the retry loop.
+    """
+    @functools.wraps(create)
+    async def call(*args, **kwargs):
+        async for attempt in AsyncRetrying(**RETRY_POLICY):
+            with attempt:
+                return await create(*args, **kwargs)
+
+    return call